@@ -6,6 +6,7 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import threading
 from pdf_processor import PDFProcessor
+from extraction_cache import ExtractionCache
 from tts_engine import TTSEngine
 
 
@@ -16,6 +17,12 @@ class AudiobookApp:
         self.root.geometry("1000x700")
         
         self.pdf_processor = None
+        try:
+            self.extraction_cache = ExtractionCache()
+        except OSError as e:
+            # Unwritable cache directory: run without the cache
+            print(f"Note: extraction cache unavailable: {e}")
+            self.extraction_cache = None
         self.tts_engine = TTSEngine()
         self.current_chapter = 0
         self.is_reading = False
@@ -170,7 +177,7 @@ class AudiobookApp:
         self.root.update()
         
         try:
-            self.pdf_processor = PDFProcessor(filename)
+            self.pdf_processor = PDFProcessor(filename, cache=self.extraction_cache)
             self.pdf_processor.extract_text()
             chapters = self.pdf_processor.detect_chapters()
             
@@ -0,0 +1,365 @@
+"""
+Extraction Throughput Benchmark
+Generates synthetic PDFs offline and measures extraction speed and memory per stage
+
+Usage:
+    python benchmark_extraction.py                          # default corpus, JSON to stdout
+    python benchmark_extraction.py --pages 10 500 5000 --columns 1 2 -o results.json
+    python benchmark_extraction.py --compare baseline.json  # flag slowdowns (exit code 1)
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 54
+BODY_FONT_SIZE = 10
+HEADING_FONT_SIZE = 16
+LEADING = 13
+# Helvetica averages roughly half an em per character
+AVG_CHAR_WIDTH = 0.5 * BODY_FONT_SIZE
+
+WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or his from at which "
+    "but have an they you were their one all we can her has there been if more when will would "
+    "who so no reading chapter story voice page narrative memory river window morning silence "
+    "letter garden history evening journey distance question answer mountain harbor"
+).split()
+
+DEFAULT_PAGES = [10, 100, 1000]
+DEFAULT_COLUMNS = [1, 2]
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_MIN_DELTA = 0.05  # Seconds a stage must slow down by before it counts
+CASE_TIMEOUT = 3600
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _wrap_words(rng: random.Random, width_chars: int, line_count: int) -> List[str]:
+    lines = []
+    for _ in range(line_count):
+        line = []
+        length = 0
+        while True:
+            word = rng.choice(WORDS)
+            if length + len(word) + 1 > width_chars:
+                break
+            line.append(word)
+            length += len(word) + 1
+        lines.append(' '.join(line))
+    return lines
+
+
+def _page_content(rng: random.Random, page_number: int, columns: int,
+                  chapter_number: Optional[int], header: bool, footer: bool) -> bytes:
+    """Build the content stream for one page"""
+    ops = ['BT']
+    
+    if header:
+        ops.append(f"/F1 9 Tf 1 0 0 1 {MARGIN} {PAGE_HEIGHT - 36} Tm (Synthetic Book - Benchmark Edition) Tj")
+    if footer:
+        ops.append(f"/F1 9 Tf 1 0 0 1 {PAGE_WIDTH // 2} 30 Tm ({page_number}) Tj")
+    
+    top = PAGE_HEIGHT - 80
+    if chapter_number is not None:
+        ops.append(f"/F1 {HEADING_FONT_SIZE} Tf 1 0 0 1 {MARGIN} {top} Tm (Chapter {chapter_number}) Tj")
+        top -= 40
+    
+    gutter = 24
+    column_width = (PAGE_WIDTH - 2 * MARGIN - gutter * (columns - 1)) / columns
+    width_chars = int(column_width / AVG_CHAR_WIDTH)
+    line_count = int((top - 60) / LEADING)
+    
+    ops.append(f"/F1 {BODY_FONT_SIZE} Tf")
+    for column in range(columns):
+        x = MARGIN + column * (column_width + gutter)
+        for i, line in enumerate(_wrap_words(rng, width_chars, line_count)):
+            ops.append(f"1 0 0 1 {x:.1f} {top - i * LEADING} Tm ({_pdf_escape(line)}) Tj")
+    
+    ops.append('ET')
+    return '\n'.join(ops).encode('latin-1')
+
+
+def generate_pdf(path: str, pages: int, columns: int = 1, chapter_every: int = 12,
+                 header: bool = True, footer: bool = True, seed: int = 0):
+    """
+    Write a synthetic text PDF without third-party libraries
+    
+    Args:
+        path: Output file path
+        pages: Number of pages
+        columns: Text columns per page
+        chapter_every: Start a new chapter every N pages
+        header: Add a running header line
+        footer: Add a page-number footer
+        seed: Random seed for the generated words
+    """
+    rng = random.Random(seed)
+    offsets = []
+    
+    with open(path, 'wb') as f:
+        def write_object(number: int, body: bytes):
+            offsets.append((number, f.tell()))
+            f.write(f"{number} 0 obj\n".encode('latin-1') + body + b"\nendobj\n")
+        
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        
+        # Objects 1-3: catalog, page tree, font; then a page and a content stream per page
+        kids = ' '.join(f"{4 + 2 * i} 0 R" for i in range(pages))
+        write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        write_object(2, f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode('latin-1'))
+        write_object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        
+        for i in range(pages):
+            page_number = i + 1
+            chapter = page_number // chapter_every + 1 if i % chapter_every == 0 else None
+            content = _page_content(rng, page_number, columns, chapter, header, footer)
+            write_object(4 + 2 * i, (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+            ).encode('latin-1'))
+            write_object(5 + 2 * i, f"<< /Length {len(content)} >>\nstream\n".encode('latin-1')
+                         + content + b"\nendstream")
+        
+        xref_offset = f.tell()
+        object_count = 3 + 2 * pages
+        f.write(f"xref\n0 {object_count + 1}\n".encode('latin-1'))
+        f.write(b"0000000000 65535 f \n")
+        for _, offset in sorted(offsets):
+            f.write(f"{offset:010d} 00000 n \n".encode('latin-1'))
+        f.write(f"trailer\n<< /Size {object_count + 1} /Root 1 0 R >>\n"
+                f"startxref\n{xref_offset}\n%%EOF\n".encode('latin-1'))
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_case(pdf_path: str, path_name: str, workers: int, result_queue):
+    """Benchmark one extraction path on one PDF (runs in a fresh process)"""
+    from pdf_processor import PDFProcessor
+    
+    baseline_rss = _peak_rss_mb()
+    processor = PDFProcessor(pdf_path, use_ai=False, workers=workers,
+                             backend=None if path_name == 'deepdoctection' else path_name,
+                             use_ocr=False)
+    stages = {}
+    
+    start = time.perf_counter()
+    if path_name == 'deepdoctection':
+        pages = list(processor._extract_with_deepdoctection())
+    elif path_name == 'pdfplumber':
+        pages = list(processor._extract_with_pdfplumber_auto())
+    else:
+        pages = list(processor.iter_pages())
+    stages['extract'] = time.perf_counter() - start
+    processor.pages = pages
+    
+    raw_texts = [(page['text'], page['page_number']) for page in pages]
+    start = time.perf_counter()
+    for text, page_number in raw_texts:
+        processor._clean_text(text, page_number)
+    stages['clean_text'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    chapters = processor.detect_chapters()
+    stages['detect_chapters'] = time.perf_counter() - start
+    
+    try:
+        from ai_text_analyzer import AITextAnalyzer
+        analyzer = AITextAnalyzer()
+        start = time.perf_counter()
+        analyzer.detect_chapters_advanced(pages)
+        stages['detect_chapters_ai'] = time.perf_counter() - start
+    except ImportError:
+        pass
+    
+    peak_rss = _peak_rss_mb()
+    page_count = len(pages)
+    result_queue.put({
+        'pages_extracted': page_count,
+        'chapters_detected': len(chapters),
+        'stage_seconds': {name: round(value, 4) for name, value in stages.items()},
+        'pages_per_sec': round(page_count / stages['extract'], 2) if stages['extract'] else None,
+        'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+        'rss_mb_per_page': round((peak_rss - baseline_rss) / page_count, 4)
+        if peak_rss is not None and page_count else None
+    })
+
+
+def _wait_for_result(process, result_queue) -> Dict:
+    """Result of a case process, or an error once it dies or times out"""
+    deadline = time.monotonic() + CASE_TIMEOUT
+    while True:
+        try:
+            return result_queue.get(timeout=1)
+        except queue.Empty:
+            if process.is_alive() and time.monotonic() < deadline:
+                continue
+        try:
+            return result_queue.get_nowait()
+        except queue.Empty:
+            process.terminate()
+            return {'error': f"no result (exit code {process.exitcode})"}
+
+
+def run_benchmarks(page_counts: List[int], columns_list: List[int], paths: List[str],
+                   workers: int = 1, corpus_dir: Optional[str] = None,
+                   deepdoc_max_pages: int = 100) -> Dict:
+    """
+    Generate the corpus and benchmark every extraction path on it
+    
+    Returns:
+        Dictionary with environment info and one result per case
+    """
+    corpus_dir = corpus_dir or tempfile.mkdtemp(prefix='readmebook-bench-')
+    os.makedirs(corpus_dir, exist_ok=True)
+    context = multiprocessing.get_context('spawn')
+    
+    results = {}
+    for pages in page_counts:
+        for columns in columns_list:
+            pdf_path = os.path.join(corpus_dir, f"synthetic-{pages}p-{columns}col.pdf")
+            if not os.path.exists(pdf_path):
+                generate_pdf(pdf_path, pages, columns=columns)
+            size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+            
+            for path_name in paths:
+                if path_name == 'deepdoctection' and pages > deepdoc_max_pages:
+                    continue
+                
+                case = f"{path_name}/{pages}p/{columns}col"
+                result_queue = context.Queue()
+                process = context.Process(target=_run_case, args=(pdf_path, path_name, workers, result_queue))
+                process.start()
+                result = _wait_for_result(process, result_queue)
+                process.join()
+                
+                result.update({'pages': pages, 'columns': columns, 'pdf_mb': round(size_mb, 2)})
+                results[case] = result
+                print(f"  {case}: {result.get('pages_per_sec')} pages/sec", file=sys.stderr)
+    
+    return {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'cpu_count': os.cpu_count(),
+        'workers': workers,
+        'results': results
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD,
+                    min_delta: float = DEFAULT_MIN_DELTA) -> List[Dict]:
+    """
+    Flag cases that got slower than the baseline by more than the threshold
+    
+    Args:
+        current: Output of run_benchmarks()
+        baseline: Previously stored output of run_benchmarks()
+        threshold: Allowed relative slowdown (0.15 = 15%)
+        min_delta: Absolute slowdown in seconds a stage also needs, so that
+            timer noise on sub-millisecond stages is not flagged
+    
+    Returns:
+        List of regressions
+    """
+    regressions = []
+    for case, result in current['results'].items():
+        base = baseline.get('results', {}).get(case)
+        if not base or 'error' in result or 'error' in base:
+            continue
+        
+        if base.get('pages_per_sec') and result.get('pages_per_sec'):
+            change = result['pages_per_sec'] / base['pages_per_sec'] - 1
+            if change < -threshold:
+                regressions.append({'case': case, 'metric': 'pages_per_sec',
+                                    'baseline': base['pages_per_sec'],
+                                    'current': result['pages_per_sec'],
+                                    'change': round(change, 3)})
+        
+        for stage, seconds in result.get('stage_seconds', {}).items():
+            base_seconds = base.get('stage_seconds', {}).get(stage)
+            if (base_seconds and seconds > base_seconds * (1 + threshold)
+                    and seconds - base_seconds > min_delta):
+                regressions.append({'case': case, 'metric': f"stage_seconds.{stage}",
+                                    'baseline': base_seconds, 'current': seconds,
+                                    'change': round(seconds / base_seconds - 1, 3)})
+    
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction throughput on synthetic PDFs")
+    parser.add_argument('--pages', type=int, nargs='+', default=DEFAULT_PAGES,
+                        help="Page counts to generate (10 to 5000)")
+    parser.add_argument('--columns', type=int, nargs='+', default=DEFAULT_COLUMNS,
+                        help="Column layouts to generate")
+    parser.add_argument('--paths', nargs='+', default=None,
+                        help="Extraction paths (pdfplumber, pdfminer, pypdfium2, deepdoctection)")
+    parser.add_argument('--workers', type=int, default=1, help="Workers for pdfplumber extraction")
+    parser.add_argument('--corpus-dir', help="Directory to keep generated PDFs between runs")
+    parser.add_argument('--deepdoc-max-pages', type=int, default=100,
+                        help="Skip deepdoctection on larger documents")
+    parser.add_argument('-o', '--output', help="Write JSON results to this file")
+    parser.add_argument('--compare', help="Baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown that counts as a regression")
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help="Seconds a stage must slow down by to count as a regression")
+    args = parser.parse_args(argv)
+    
+    paths = args.paths
+    if paths is None:
+        from deepdoc_processor import DEEPDOC_AVAILABLE
+        from extraction_backends import PDFMINER_AVAILABLE, PDFIUM_AVAILABLE
+        paths = ['pdfplumber']
+        if PDFMINER_AVAILABLE:
+            paths.append('pdfminer')
+        if PDFIUM_AVAILABLE:
+            paths.append('pypdfium2')
+        if DEEPDOC_AVAILABLE:
+            paths.append('deepdoctection')
+    
+    report = run_benchmarks(args.pages, args.columns, paths, workers=args.workers,
+                            corpus_dir=args.corpus_dir, deepdoc_max_pages=args.deepdoc_max_pages)
+    
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['regressions'] = compare_results(report, baseline, args.threshold, args.min_delta)
+        if report['regressions']:
+            exit_code = 1
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""
+OCR Throughput and Accuracy Benchmark
+Renders known text offline with PIL and measures OCR speed, accuracy and memory
+
+Every configuration (engine, font, size, DPI, distortion, PSM, preprocessing)
+runs in a fresh process on the same synthetic pages.
+
+Usage:
+    python benchmark_ocr.py                                  # default matrix, JSON to stdout
+    python benchmark_ocr.py --dpis 150 200 300 --distortions clean noisy skewed -o ocr.json
+    python benchmark_ocr.py --engines tesserocr pytesseract --lines 8
+    python benchmark_ocr.py --compare baseline.json          # flag regressions (exit code 1)
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+from benchmark_extraction import WORDS, _peak_rss_mb, _wait_for_result
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+DEFAULT_PAGES = 5
+DEFAULT_LINES = 12
+DEFAULT_DPIS = [200, 300]
+DEFAULT_FONT_SIZES = [11]
+DEFAULT_FONTS = ['default', 'DejaVuSerif.ttf']
+DEFAULT_DISTORTIONS = ['clean', 'noisy', 'skewed']
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_CER_TOLERANCE = 0.01    # absolute character error rate increase allowed
+FONT_SIZE_PT = 12
+PAGE_SIZE_IN = (8.5, 11.0)
+MARGIN_IN = 0.75
+NOISE_SIGMA = 25
+SALT_PEPPER = 0.002
+SKEW_DEGREES = 2.0
+
+# Named preprocessing pipelines (see ocr_processor.PREPROCESSING_STEPS)
+PREPROCESSING_PRESETS = {
+    'none': (),
+    'basic': ('remove_border', 'binarize'),
+    'full': ('remove_border', 'deskew', 'downscale', 'binarize')
+}
+
+
+def page_lines(seed: int, line_count: int, words_per_line: int = 9) -> List[str]:
+    """Deterministic random text lines for one page"""
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(WORDS) for _ in range(words_per_line)) for _ in range(line_count)]
+
+
+def load_font(font: str, size_px: int):
+    """PIL font by file name or path ('default' is Pillow's bundled font)"""
+    from PIL import ImageFont
+    
+    if font == 'default':
+        return ImageFont.load_default(size=size_px)
+    return ImageFont.truetype(font, size_px)
+
+
+def render_page(lines: List[str], dpi: int = 300, font_size_pt: int = FONT_SIZE_PT,
+                font: str = 'default', distortion: str = 'clean', seed: int = 0):
+    """
+    Render text lines onto a white grayscale page with PIL
+    
+    Args:
+        lines: Text lines (the ground truth)
+        dpi: Page resolution
+        font_size_pt: Font size in points
+        font: Font file name or path, or 'default'
+        distortion: 'clean', 'noisy' (gaussian plus salt-and-pepper noise)
+            or 'skewed' (rotated by SKEW_DEGREES)
+        seed: Noise seed
+    
+    Returns:
+        PIL Image at the requested DPI
+    """
+    from PIL import Image, ImageDraw
+    
+    width, height = int(PAGE_SIZE_IN[0] * dpi), int(PAGE_SIZE_IN[1] * dpi)
+    font_px = max(8, round(font_size_pt * dpi / 72))
+    pil_font = load_font(font, font_px)
+    
+    image = Image.new('L', (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    x = y = int(MARGIN_IN * dpi)
+    for line in lines:
+        draw.text((x, y), line, fill=0, font=pil_font)
+        y += int(font_px * 1.4)
+    
+    if distortion == 'skewed':
+        image = image.rotate(SKEW_DEGREES, resample=Image.BILINEAR, fillcolor=255)
+    elif distortion == 'noisy':
+        import numpy as np
+        rng = np.random.default_rng(seed)
+        pixels = np.asarray(image, dtype=np.float32) + rng.normal(0, NOISE_SIGMA, (height, width))
+        specks = rng.random((height, width))
+        pixels[specks < SALT_PEPPER / 2] = 0
+        pixels[specks > 1 - SALT_PEPPER / 2] = 255
+        image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    elif distortion != 'clean':
+        raise ValueError(f"Unknown distortion '{distortion}'")
+    
+    return image
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """Levenshtein distance over the reference length, with whitespace runs collapsed"""
+    reference = ' '.join(reference.split())
+    hypothesis = ' '.join(hypothesis.split())
+    if not reference:
+        return float(bool(hypothesis))
+    
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_char in enumerate(reference, start=1):
+        current = [i]
+        for j, hyp_char in enumerate(hypothesis, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_char != hyp_char)))
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def _peak_child_rss_mb() -> Optional[float]:
+    """Largest resident size of any finished child process (the tesseract CLI)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_case(config: Dict, pages: int, lines: int, language: str, result_queue):
+    """OCR the synthetic pages with one configuration (runs in a fresh process)"""
+    from ocr_processor import OCRProcessor
+    
+    processor = OCRProcessor(language=language, engine=config['engine'],
+                             preprocessing=PREPROCESSING_PRESETS[config['preprocessing']],
+                             skip_blank_pages=False)
+    if processor.engine != config['engine']:
+        result_queue.put({'error': f"{config['engine']} not available"})
+        return
+    processor.psm = config['psm']
+    
+    page_seconds = []
+    errors = []
+    for page_number in range(1, pages + 1):
+        truth = page_lines(page_number, lines)
+        image = render_page(truth, config['dpi'], config['font_size'], config['font'],
+                            config['distortion'], seed=page_number)
+        start = time.perf_counter()
+        page_data = processor.ocr_page_image(image, page_number, dpi=config['dpi'])
+        page_seconds.append(time.perf_counter() - start)
+        image.close()
+        errors.append(character_error_rate('\n'.join(truth), page_data['text']))
+    
+    total = sum(page_seconds)
+    peak_rss = _peak_rss_mb()
+    peak_child_rss = _peak_child_rss_mb()
+    result_queue.put({
+        'pages': pages,
+        'total_seconds': round(total, 3),
+        'pages_per_min': round(pages * 60 / total, 2) if total else None,
+        # The first page includes loading the language data
+        'first_page_seconds': round(page_seconds[0], 4),
+        'median_page_seconds': round(sorted(page_seconds)[len(page_seconds) // 2], 4),
+        'cer': round(sum(errors) / len(errors), 4),
+        'worst_page_cer': round(max(errors), 4),
+        'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+        'peak_tesseract_rss_mb': round(peak_child_rss, 1) if peak_child_rss else None
+    })
+
+
+def case_name(config: Dict) -> str:
+    """Stable key for a configuration, used to match results against a baseline"""
+    return (f"{config['engine']}/{os.path.basename(config['font'])}/{config['font_size']}pt/"
+            f"{config['dpi']}dpi/{config['distortion']}/psm{config['psm']}/{config['preprocessing']}")
+
+
+def run_benchmarks(configs: List[Dict], pages: int = DEFAULT_PAGES, lines: int = DEFAULT_LINES,
+                   language: str = 'eng') -> Dict:
+    """
+    Benchmark every configuration on the same synthetic pages
+    
+    Returns:
+        Dictionary with environment info and one result per configuration
+    """
+    context = multiprocessing.get_context('spawn')
+    
+    results = {}
+    for config in configs:
+        case = case_name(config)
+        result_queue = context.Queue()
+        process = context.Process(target=_run_case, args=(config, pages, lines, language, result_queue))
+        process.start()
+        result = _wait_for_result(process, result_queue)
+        process.join()
+        
+        result.update(config)
+        results[case] = result
+        print(f"  {case}: {result.get('pages_per_min')} pages/min, CER {result.get('cer')}",
+              file=sys.stderr)
+    
+    return {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'cpu_count': os.cpu_count(),
+        'tesseract': _tesseract_version(),
+        'lines_per_page': lines,
+        'results': results
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD,
+                    cer_tolerance: float = DEFAULT_CER_TOLERANCE) -> List[Dict]:
+    """
+    Flag configurations that got slower or less accurate than the baseline
+    
+    Args:
+        current: Output of run_benchmarks()
+        baseline: Previously stored output of run_benchmarks()
+        threshold: Allowed relative throughput drop (0.15 = 15%)
+        cer_tolerance: Allowed absolute character error rate increase
+    
+    Returns:
+        List of regressions
+    """
+    regressions = []
+    for case, result in current['results'].items():
+        base = baseline.get('results', {}).get(case)
+        if not base or 'error' in result or 'error' in base:
+            continue
+        
+        if base.get('pages_per_min') and result.get('pages_per_min'):
+            change = result['pages_per_min'] / base['pages_per_min'] - 1
+            if change < -threshold:
+                regressions.append({'case': case, 'metric': 'pages_per_min',
+                                    'baseline': base['pages_per_min'],
+                                    'current': result['pages_per_min'],
+                                    'change': round(change, 3)})
+        
+        if result['cer'] > base['cer'] + cer_tolerance:
+            regressions.append({'case': case, 'metric': 'cer',
+                                'baseline': base['cer'], 'current': result['cer'],
+                                'change': round(result['cer'] - base['cer'], 4)})
+    
+    return regressions
+
+
+def _tesseract_version() -> Optional[str]:
+    try:
+        import pytesseract
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return None
+
+
+def _available_fonts(fonts: List[str]) -> List[str]:
+    """Drop fonts PIL cannot find on this machine"""
+    available = []
+    for font in fonts:
+        try:
+            load_font(font, 12)
+            available.append(font)
+        except OSError:
+            print(f"  skipping font {font}: not found", file=sys.stderr)
+    return available
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark OCR speed and accuracy on synthetic pages")
+    parser.add_argument('--pages', type=int, default=DEFAULT_PAGES, help="Pages per configuration")
+    parser.add_argument('--lines', type=int, default=DEFAULT_LINES,
+                        help="Text lines per page (short pages expose per-call overhead)")
+    parser.add_argument('--dpis', type=int, nargs='+', default=DEFAULT_DPIS, help="Render resolutions")
+    parser.add_argument('--fonts', nargs='+', default=DEFAULT_FONTS,
+                        help="Font files or names ('default' is Pillow's bundled font)")
+    parser.add_argument('--font-sizes', type=int, nargs='+', default=DEFAULT_FONT_SIZES,
+                        help="Font sizes in points")
+    parser.add_argument('--distortions', nargs='+', default=DEFAULT_DISTORTIONS,
+                        choices=['clean', 'noisy', 'skewed'], help="Page distortions")
+    parser.add_argument('--psm', type=int, nargs='+', default=[1],
+                        help="Tesseract page segmentation modes")
+    parser.add_argument('--preprocessing', nargs='+', default=['none'],
+                        choices=sorted(PREPROCESSING_PRESETS), help="Preprocessing presets")
+    parser.add_argument('--language', default='eng', help="Tesseract language code")
+    parser.add_argument('--engines', nargs='+', default=None,
+                        help="Engines to compare (tesserocr, pytesseract)")
+    parser.add_argument('-o', '--output', help="Write JSON results to this file")
+    parser.add_argument('--compare', help="Baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative throughput drop that counts as a regression")
+    parser.add_argument('--cer-tolerance', type=float, default=DEFAULT_CER_TOLERANCE,
+                        help="Absolute CER increase that counts as a regression")
+    args = parser.parse_args(argv)
+    
+    engines = args.engines
+    if engines is None:
+        from ocr_processor import TESSEROCR_AVAILABLE
+        engines = ['pytesseract']
+        if TESSEROCR_AVAILABLE:
+            engines.append('tesserocr')
+    
+    configs = [
+        {'engine': engine, 'font': font, 'font_size': size, 'dpi': dpi,
+         'distortion': distortion, 'psm': psm, 'preprocessing': preprocessing}
+        for engine, font, size, dpi, distortion, psm, preprocessing in itertools.product(
+            engines, _available_fonts(args.fonts), args.font_sizes, args.dpis,
+            args.distortions, args.psm, args.preprocessing)
+    ]
+    report = run_benchmarks(configs, args.pages, args.lines, args.language)
+    
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['regressions'] = compare_results(report, baseline, args.threshold, args.cer_tolerance)
+        if report['regressions']:
+            exit_code = 1
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
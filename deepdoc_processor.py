@@ -2,10 +2,14 @@
 Advanced PDF Layout Extraction using deepdoctection
 Provides enhanced layout analysis for complex PDFs with columns, tables, and images
 """
+import os
+import threading
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
-from typing import List, Dict, Optional, TYPE_CHECKING
+from contextlib import contextmanager
+from typing import List, Dict, Iterator, Optional, Sequence, Tuple, TYPE_CHECKING
 
 # Check if deepdoctection is available
 try:
@@ -18,42 +22,235 @@ except ImportError:
         from deepdoctection.datapoint import Page
 
 
+INSTALL_MESSAGE = (
+    "deepdoctection not available. Install with:\n"
+    "pip install deepdoctection[pt]\n"
+    "Note: This is a heavy dependency with significant disk space requirements"
+)
+
+# Analyzers handed out per (language, config) unless a larger pool is requested
+DEFAULT_POOL_SIZE = 1
+# Seconds a thread waits for another thread to release an analyzer
+ACQUIRE_TIMEOUT = 600.0
+
+# Process-wide analyzer pools, so each process loads the models once
+_analyzer_pools = {}
+_analyzer_pools_lock = threading.Lock()
+
+
+class AnalyzerPool:
+    """
+    Shared deepdoctection analyzers for one language and configuration
+    
+    Analyzers are loaded on demand, up to max_size, and lent to one caller
+    at a time. Other threads wait (up to a timeout) while all of them are
+    busy. A thread that already holds one, e.g. while a lazy stream is paused,
+    gets an extra analyzer instead, since it would otherwise wait on itself;
+    the extra one stays in the pool for later callers.
+    """
+    
+    def __init__(self, language: str = 'en', config: Optional[Sequence[str]] = None,
+                 max_size: int = DEFAULT_POOL_SIZE, timeout: float = ACQUIRE_TIMEOUT):
+        """
+        Args:
+            language: Document language the analyzers are used for
+            config: deepdoctection config overrides ('KEY=VALUE' entries)
+            max_size: Analyzers shared between threads (one per concurrent caller)
+            timeout: Seconds acquire() waits for a busy pool before raising
+        """
+        self.language = language
+        self.config = tuple(config or ())
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self._idle = []
+        self._created = 0
+        # Analyzers currently lent out (by id) and how many each thread holds
+        self._lent = {}
+        self._held = {}
+        self._condition = threading.Condition()
+    
+    @property
+    def size(self) -> int:
+        """Number of analyzers loaded so far"""
+        return self._created
+    
+    def set_max_size(self, max_size: int):
+        """Allow more (or fewer) analyzers; existing ones are kept"""
+        with self._condition:
+            self.max_size = max(1, max_size)
+            self._condition.notify_all()
+    
+    def acquire(self):
+        """
+        Take an idle analyzer, load a new one, or wait for one to be released
+        
+        Raises:
+            RuntimeError: If no analyzer became free within the timeout
+        """
+        thread = threading.get_ident()
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            while not self._idle and self._created >= self.max_size and not self._held.get(thread):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(
+                        f"No deepdoctection analyzer became free within {self.timeout:g}s "
+                        f"(pool size {self.max_size}); close unfinished streams or raise pool_size"
+                    )
+                self._condition.wait(remaining)
+            self._held[thread] = self._held.get(thread, 0) + 1
+            if self._idle:
+                dd_analyzer = self._idle.pop()
+                self._lent[id(dd_analyzer)] = thread
+                return dd_analyzer
+            self._created += 1
+        
+        # Models load outside the lock so other callers can take idle analyzers meanwhile
+        try:
+            dd_analyzer = self._load_analyzer()
+        except Exception:
+            with self._condition:
+                self._drop_hold(thread)
+            raise
+        with self._condition:
+            self._lent[id(dd_analyzer)] = thread
+        return dd_analyzer
+    
+    def release(self, dd_analyzer):
+        """Return an analyzer taken with acquire() (from any thread)"""
+        with self._condition:
+            thread = self._lent.pop(id(dd_analyzer), None)
+            if thread is not None:
+                self._drop_hold(thread)
+            self._idle.append(dd_analyzer)
+            self._condition.notify()
+    
+    def _drop_hold(self, thread: int):
+        self._held[thread] -= 1
+        if not self._held[thread]:
+            del self._held[thread]
+    
+    @contextmanager
+    def borrow(self):
+        """Context manager around acquire() and release()"""
+        dd_analyzer = self.acquire()
+        try:
+            yield dd_analyzer
+        finally:
+            self.release(dd_analyzer)
+    
+    def warm_up(self, count: int = 1):
+        """Load analyzers until at least count (capped at max_size) exist"""
+        count = min(count, self.max_size)
+        while True:
+            with self._condition:
+                if self._created >= count:
+                    return
+                self._created += 1
+            self.release(self._load_analyzer())
+    
+    def _load_analyzer(self):
+        """Build one analyzer; its slot in _created is already reserved"""
+        try:
+            if self.config:
+                return analyzer.get_dd_analyzer(config_overwrite=list(self.config))
+            # Models are automatically managed by deepdoctection
+            return analyzer.get_dd_analyzer()
+        except Exception as e:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise RuntimeError(
+                f"Failed to initialize deepdoctection analyzer: {str(e)}\n"
+                "Please ensure all model dependencies are properly installed."
+            )
+
+
+def get_analyzer_pool(language: str = 'en', config: Optional[Sequence[str]] = None,
+                      max_size: Optional[int] = None) -> AnalyzerPool:
+    """
+    Return this process's analyzer pool for the language and configuration
+    
+    Args:
+        language: Document language
+        config: deepdoctection config overrides ('KEY=VALUE' entries)
+        max_size: Grow the pool to at least this many analyzers
+    
+    Returns:
+        Shared AnalyzerPool (created empty on first use)
+    """
+    if not DEEPDOC_AVAILABLE:
+        raise ImportError(INSTALL_MESSAGE)
+    
+    key = (language, tuple(config or ()))
+    with _analyzer_pools_lock:
+        pool = _analyzer_pools.get(key)
+        if pool is None:
+            pool = AnalyzerPool(language, config, max_size or DEFAULT_POOL_SIZE)
+            _analyzer_pools[key] = pool
+    
+    if max_size and max_size > pool.max_size:
+        pool.set_max_size(max_size)
+    return pool
+
+
+def warm_up(language: str = 'en', config: Optional[Sequence[str]] = None, instances: int = 1):
+    """
+    Load deepdoctection models before the first document arrives
+    
+    Call at service start, or pass as a ProcessPoolExecutor initializer so
+    each worker loads the models once and reuses them across documents.
+    
+    Args:
+        language: Document language
+        config: deepdoctection config overrides ('KEY=VALUE' entries)
+        instances: Analyzers to load (for that many concurrent callers)
+    """
+    get_analyzer_pool(language, config, instances).warm_up(instances)
+
+
+def clear_analyzer_pools():
+    """Forget all shared analyzers so their models can be freed"""
+    with _analyzer_pools_lock:
+        _analyzer_pools.clear()
+
+
 class DeepDocProcessor:
     """
     Advanced PDF processor using deepdoctection for layout analysis
     Handles complex PDFs with columns, tables, images, and structured layouts
     """
     
-    def __init__(self, language: str = 'en'):
+    def __init__(self, language: str = 'en', config: Optional[Sequence[str]] = None,
+                 pool_size: Optional[int] = None):
         """
         Initialize deepdoctection processor
         
+        Processors with the same language and config share the analyzers of
+        a process-wide pool, so the models are only loaded once per process.
+        
         Args:
             language: Document language ('en', 'pt', etc.)
+            config: deepdoctection config overrides ('KEY=VALUE' entries)
+            pool_size: Analyzers the shared pool may hold for concurrent callers
+                (default: DEFAULT_POOL_SIZE)
         """
         if not DEEPDOC_AVAILABLE:
-            raise ImportError(
-                "deepdoctection not available. Install with:\n"
-                "pip install deepdoctection[pt]\n"
-                "Note: This is a heavy dependency with significant disk space requirements"
-            )
+            raise ImportError(INSTALL_MESSAGE)
         
         self.language = language
-        self.analyzer = None
+        self.config = tuple(config or ())
+        self.pool_size = pool_size
+        self.pool = None
+        # Result of the last fully analyzed document and the key it was built for
+        self._analysis = None
+        self._analysis_key = None
         self._initialize_analyzer()
     
     def _initialize_analyzer(self):
-        """Initialize the deepdoctection analyzer with optimal settings"""
-        try:
-            # Create analyzer with layout detection enabled
-            # Note: Using default model configuration for better compatibility
-            # Models are automatically managed by deepdoctection
-            self.analyzer = analyzer.get_dd_analyzer()
-        except Exception as e:
-            raise RuntimeError(
-                f"Failed to initialize deepdoctection analyzer: {str(e)}\n"
-                "Please ensure all model dependencies are properly installed."
-            )
+        """Attach to the shared analyzer pool, loading the models if this process has not yet"""
+        self.pool = get_analyzer_pool(self.language, self.config, self.pool_size)
+        self.pool.warm_up(1)
     
     def extract_text_with_layout(self, pdf_path: str) -> List[Dict]:
         """
@@ -65,23 +262,101 @@ class DeepDocProcessor:
         Returns:
             List of page dictionaries with enhanced layout information
         """
-        if not self.analyzer:
+        return list(self.iter_text_with_layout(pdf_path))
+    
+    def iter_text_with_layout(self, pdf_path: str, retain: bool = True) -> Iterator[Dict]:
+        """
+        Yield pages with layout information one at a time
+        
+        deepdoctection analyzes lazily, so only the current deepdoctection
+        page is held in memory while the caller consumes the stream.
+        
+        Args:
+            pdf_path: Path to PDF file
+            retain: Keep the page records as the document's analysis once the
+                stream completes (see analyze()). Pass False for flat memory when
+                the caller keeps or discards pages itself; a result that is
+                already kept is still reused.
+            
+        Yields:
+            Page dictionaries with enhanced layout information
+        """
+        for page_data, _ in self._iter_analysis(pdf_path, retain):
+            # Copies, so callers can reshape records without altering the kept analysis
+            yield dict(page_data)
+    
+    def analyze(self, pdf_path: str) -> Dict:
+        """
+        Run layout analysis once per document and keep the result
+        
+        extract_text_with_layout(), extract_tables() and get_document_structure()
+        are all served from this result. The models only run again when the
+        file (path, size or modification time) or the processor settings change.
+        
+        Args:
+            pdf_path: Path to PDF file
+            
+        Returns:
+            Dictionary with 'pages' (layout page records) and 'tables'
+        """
+        for _ in self._iter_analysis(pdf_path):
+            pass
+        return self._analysis
+    
+    def clear_analysis(self):
+        """Drop the kept analysis result (e.g. between documents in a batch job)"""
+        self._analysis = None
+        self._analysis_key = None
+    
+    def _get_analysis_key(self, pdf_path: str) -> Tuple:
+        """Identify the document version and the settings it is analyzed with"""
+        stat = os.stat(pdf_path)
+        return (os.path.abspath(pdf_path), stat.st_size, stat.st_mtime_ns,
+                self.language, self.config)
+    
+    def _iter_analysis(self, pdf_path: str, retain: bool = True) -> Iterator[Tuple[Dict, List[Dict]]]:
+        """
+        Yield (page record, page tables) from the kept analysis or a single new pass
+        
+        With retain, the result is kept once the whole document was analyzed,
+        so an abandoned stream never leaves a partial analysis behind. Without
+        it nothing is accumulated and tables are not extracted.
+        """
+        if not self.pool:
             raise RuntimeError("Analyzer not initialized")
         
-        pages_data = []
+        key = self._get_analysis_key(pdf_path)
+        if self._analysis is not None and self._analysis_key == key:
+            tables_by_page = {}
+            for table in self._analysis['tables']:
+                tables_by_page.setdefault(table['page'], []).append(table)
+            for page_data in self._analysis['pages']:
+                yield page_data, tables_by_page.get(page_data['page_number'], [])
+            return
         
+        pages = []
+        tables = []
         try:
-            # Analyze document
-            df = self.analyzer.analyze(path=pdf_path)
-            
-            for page_idx, page in enumerate(df, start=1):
-                page_data = self._process_page(page, page_idx)
-                pages_data.append(page_data)
+            # Analysis is lazy, so the analyzer stays borrowed until the last page
+            with self.pool.borrow() as dd_analyzer:
+                df = dd_analyzer.analyze(path=pdf_path)
+                
+                for page_idx, page in enumerate(df, start=1):
+                    page_data = self._process_page(page, page_idx)
+                    if not retain:
+                        yield page_data, []
+                        continue
+                    page_tables = self._process_tables(page, page_idx)
+                    pages.append(page_data)
+                    tables.extend(page_tables)
+                    yield page_data, page_tables
         
         except Exception as e:
             raise RuntimeError(f"deepdoctection processing failed: {str(e)}")
         
-        return pages_data
+        if retain:
+            self._analysis = {'pages': pages, 'tables': tables}
+            self._analysis_key = key
     
     def _process_page(self, page: 'Page', page_number: int) -> Dict:
         """
@@ -187,28 +462,19 @@ class DeepDocProcessor:
         Returns:
             List of table dictionaries with data and metadata
         """
-        if not self.analyzer:
-            raise RuntimeError("Analyzer not initialized")
-        
+        return [dict(table) for table in self.analyze(pdf_path)['tables']]
+    
+    def _process_tables(self, page: 'Page', page_number: int) -> List[Dict]:
+        """Table dictionaries for one analyzed page"""
         tables = []
-        
-        try:
-            df = self.analyzer.analyze(path=pdf_path)
-            
-            for page_idx, page in enumerate(df, start=1):
-                if hasattr(page, 'tables'):
-                    for table_idx, table in enumerate(page.tables):
-                        table_data = {
-                            'page': page_idx,
-                            'table_number': table_idx + 1,
-                            'data': self._extract_table_data(table),
-                            'bbox': self._get_bbox(table) if hasattr(table, 'bbox') else None
-                        }
-                        tables.append(table_data)
-        
-        except Exception as e:
-            raise RuntimeError(f"Table extraction failed: {str(e)}")
-        
+        if hasattr(page, 'tables'):
+            for table_idx, table in enumerate(page.tables):
+                tables.append({
+                    'page': page_number,
+                    'table_number': table_idx + 1,
+                    'data': self._extract_table_data(table),
+                    'bbox': self._get_bbox(table) if hasattr(table, 'bbox') else None
+                })
         return tables
     
     def _extract_table_data(self, table) -> List[List[str]]:
@@ -0,0 +1,466 @@
+"""
+Text Extraction Backend Registry
+Pluggable PDF text-layer extractors with declared speed and quality tiers
+"""
+import math
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+import pdfplumber
+
+if TYPE_CHECKING:
+    from pdf_processor import PDFProcessor
+
+# Check optional fast backends
+try:
+    from pdfminer.pdfdevice import PDFDevice, PDFTextDevice
+    from pdfminer.pdffont import PDFUnicodeNotDefined
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.utils import apply_matrix_pt
+    PDFMINER_AVAILABLE = True
+except ImportError:
+    PDFMINER_AVAILABLE = False
+
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+
+# Plain-text reconstruction without layout analysis (see _TextLineDevice),
+# as fractions of the font size
+LINE_BREAK_SHIFT = 0.5          # baseline moves this far: start a new line
+WORD_GAP = 0.25                 # horizontal gaps wider than this become a space
+
+# Per-page classification (see classify_page)
+PAGE_TEXT_MIN_CHARS = 20        # fewer embedded characters means no usable text layer
+SCANNED_MIN_COVERAGE = 0.1      # share of the page images must cover to be worth OCR
+MIXED_MIN_COVERAGE = 0.3        # text pages with more image area than this are 'mixed'
+
+
+class ExtractionBackend:
+    """
+    Base class for text extraction backends
+    
+    Subclasses set name, speed and quality (higher is better on both) and
+    implement iter_pages(). Register instances with register_backend().
+    """
+    
+    name = ''
+    speed = 0
+    quality = 0
+    # Whether the backend only reads an existing text layer (no layout models / OCR)
+    needs_text_layer = False
+    
+    def is_available(self, processor: 'PDFProcessor') -> bool:
+        """Check that the backend's dependencies are installed"""
+        return True
+    
+    def can_handle(self, processor: 'PDFProcessor') -> bool:
+        """Check that the backend can extract this document"""
+        if self.needs_text_layer:
+            page_types = processor._get_page_types()
+            # Scanned pages are only routed to OCR on the pdfplumber path
+            if processor.ocr_processor is not None and 'scanned' in page_types.values():
+                return False
+            return has_text_layer(page_types)
+        return True
+    
+    def iter_pages(self, processor: 'PDFProcessor', start_page: int = 1) -> Iterator[Dict]:
+        """
+        Yield page records for the document
+        
+        Args:
+            processor: PDFProcessor requesting the extraction (used for cleaning)
+            start_page: First page to extract (1-indexed)
+        """
+        raise NotImplementedError
+    
+    def extract_pages(self, processor: 'PDFProcessor', page_numbers: Iterable[int]) -> Iterator[Dict]:
+        """
+        Yield page records for the given pages only (pages without text are omitted)
+        
+        The default reads the document from the first requested page and stops
+        after the last one; backends with random page access override it.
+        
+        Args:
+            processor: PDFProcessor requesting the extraction (used for cleaning)
+            page_numbers: 1-indexed page numbers
+        """
+        wanted = set(page_numbers)
+        if not wanted:
+            return
+        last_page = max(wanted)
+        for page in self.iter_pages(processor, start_page=min(wanted)):
+            if page['page_number'] > last_page:
+                break
+            if page['page_number'] in wanted:
+                yield page
+
+
+class DeepDocBackend(ExtractionBackend):
+    """deepdoctection layout analysis (slow, best on complex layouts)"""
+    
+    name = 'deepdoctection'
+    speed = 1
+    quality = 4
+    
+    def is_available(self, processor: 'PDFProcessor') -> bool:
+        return processor.deepdoc_processor is not None
+    
+    def iter_pages(self, processor: 'PDFProcessor', start_page: int = 1) -> Iterator[Dict]:
+        return processor._extract_with_deepdoctection()
+
+
+class PdfplumberBackend(ExtractionBackend):
+    """pdfplumber layout-aware text extraction (supports parallel workers and margin cropping)"""
+    
+    name = 'pdfplumber'
+    speed = 2
+    quality = 3
+    
+    def iter_pages(self, processor: 'PDFProcessor', start_page: int = 1) -> Iterator[Dict]:
+        return processor._extract_with_pdfplumber_auto(start_page)
+    
+    def extract_pages(self, processor: 'PDFProcessor', page_numbers: Iterable[int]) -> Iterator[Dict]:
+        return processor._extract_pdfplumber_pages(page_numbers)
+
+
+class PdfminerBackend(ExtractionBackend):
+    """pdfminer with layout analysis disabled: text in content-stream order, split into lines"""
+    
+    name = 'pdfminer'
+    speed = 3
+    quality = 2
+    needs_text_layer = True
+    
+    def is_available(self, processor: 'PDFProcessor') -> bool:
+        return PDFMINER_AVAILABLE
+    
+    def iter_pages(self, processor: 'PDFProcessor', start_page: int = 1) -> Iterator[Dict]:
+        return self._read_pages(processor, lambda page_number: page_number >= start_page)
+    
+    def extract_pages(self, processor: 'PDFProcessor', page_numbers: Iterable[int]) -> Iterator[Dict]:
+        wanted = set(page_numbers)
+        return self._read_pages(processor, wanted.__contains__, max(wanted, default=0))
+    
+    def _read_pages(self, processor: 'PDFProcessor', wanted, last_page: Optional[int] = None) -> Iterator[Dict]:
+        """Interpret only the pages for which wanted(page_number) is true"""
+        resource_manager = PDFResourceManager()
+        # Line breaks come from baseline moves; no layout objects are built
+        device = _TextLineDevice(resource_manager)
+        interpreter = PDFPageInterpreter(resource_manager, device)
+        
+        with open(processor.pdf_path, 'rb') as f:
+            for page_number, page in enumerate(PDFPage.get_pages(f), start=1):
+                if last_page is not None and page_number > last_page:
+                    break
+                if not wanted(page_number):
+                    continue
+                interpreter.process_page(page)
+                text = ''.join(device.parts).strip('\n')
+                if text:
+                    yield processor._make_page(page_number, text)
+
+
+class PdfiumBackend(ExtractionBackend):
+    """pypdfium2 text pages: native PDFium extraction, fastest option"""
+    
+    name = 'pypdfium2'
+    speed = 4
+    quality = 2
+    needs_text_layer = True
+    
+    def is_available(self, processor: 'PDFProcessor') -> bool:
+        return PDFIUM_AVAILABLE
+    
+    def iter_pages(self, processor: 'PDFProcessor', start_page: int = 1) -> Iterator[Dict]:
+        return self._read_pages(processor, None, start_page)
+    
+    def extract_pages(self, processor: 'PDFProcessor', page_numbers: Iterable[int]) -> Iterator[Dict]:
+        return self._read_pages(processor, sorted(set(page_numbers)))
+    
+    def _read_pages(self, processor: 'PDFProcessor', page_numbers: Optional[List[int]],
+                    start_page: int = 1) -> Iterator[Dict]:
+        """Read the given pages, or every page from start_page when page_numbers is None"""
+        pdf = pdfium.PdfDocument(processor.pdf_path)
+        try:
+            if page_numbers is None:
+                indices = range(start_page - 1, len(pdf))
+            else:
+                indices = [n - 1 for n in page_numbers if 1 <= n <= len(pdf)]
+            for index in indices:
+                page = pdf[index]
+                text_page = page.get_textpage()
+                text = text_page.get_text_range().replace('\r\n', '\n').replace('\r', '\n')
+                text_page.close()
+                page.close()
+                if text.strip():
+                    yield processor._make_page(index + 1, text)
+        finally:
+            pdf.close()
+
+
+BACKENDS: Dict[str, ExtractionBackend] = {}
+
+
+def register_backend(backend: ExtractionBackend):
+    """Add or replace a backend in the registry"""
+    BACKENDS[backend.name] = backend
+
+
+def get_backend(name: str) -> ExtractionBackend:
+    """Look up a registered backend by name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend '{name}'. Available: {', '.join(BACKENDS)}")
+    return BACKENDS[name]
+
+
+def available_backends(processor: 'PDFProcessor') -> List[ExtractionBackend]:
+    """Registered backends whose dependencies are installed, fastest first"""
+    backends = [b for b in BACKENDS.values() if b.is_available(processor)]
+    return sorted(backends, key=lambda b: (-b.speed, -b.quality))
+
+
+def select_backend(processor: 'PDFProcessor', prefer: str = 'speed') -> ExtractionBackend:
+    """
+    Choose a backend for the processor's document
+    
+    Args:
+        processor: PDFProcessor to extract
+        prefer: 'speed' for the fastest capable backend, 'quality' for the best one
+    
+    Returns:
+        Selected backend
+    """
+    if prefer == 'quality':
+        key = lambda b: (-b.quality, -b.speed)
+    elif prefer == 'speed':
+        key = lambda b: (-b.speed, -b.quality)
+    else:
+        raise ValueError("prefer must be 'speed' or 'quality'")
+    
+    candidates = sorted((b for b in BACKENDS.values() if b.is_available(processor)), key=key)
+    for backend in candidates:
+        if backend.can_handle(processor):
+            return backend
+    
+    return get_backend('pdfplumber')
+
+
+def has_text_layer(page_types: Dict[int, str]) -> bool:
+    """
+    Check whether most non-blank pages have a usable text layer
+    
+    Args:
+        page_types: Per-page classification from text_layer_map()
+    """
+    content = [page_type for page_type in page_types.values() if page_type != 'blank']
+    with_text = sum(1 for page_type in content if page_type in ('text', 'mixed'))
+    return with_text * 2 > len(content)
+
+
+def iter_heading_text(pdf_path: str, top_fraction: float) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_number, text) for the top part of every page
+    
+    Reads the text layer only (pypdfium2 bounded text, else pdfminer without
+    layout analysis), for cheap scans such as lazy chapter detection.
+    
+    Args:
+        pdf_path: Path to PDF file
+        top_fraction: Share of the page height to read, from the top edge
+    """
+    if PDFIUM_AVAILABLE:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for index in range(len(pdf)):
+                page = pdf[index]
+                left, bottom, right, top = page.get_bbox()
+                text_page = page.get_textpage()
+                text = text_page.get_text_bounded(left=left, bottom=top - (top - bottom) * top_fraction,
+                                                  right=right, top=top)
+                text_page.close()
+                page.close()
+                yield index + 1, text.replace('\r\n', '\n').replace('\r', '\n')
+        finally:
+            pdf.close()
+        return
+    
+    if PDFMINER_AVAILABLE:
+        resource_manager = PDFResourceManager()
+        device = _TextLineDevice(resource_manager, top_fraction=top_fraction)
+        interpreter = PDFPageInterpreter(resource_manager, device)
+        with open(pdf_path, 'rb') as f:
+            for page_number, page in enumerate(PDFPage.get_pages(f), start=1):
+                interpreter.process_page(page)
+                yield page_number, ''.join(device.parts).strip('\n')
+        return
+    
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            band = page.crop((0, 0, page.width, page.height * top_fraction))
+            text = band.extract_text() or ''
+            page.close()
+            yield page.page_number, text
+
+
+if PDFMINER_AVAILABLE:
+    class _PageInventoryDevice(PDFDevice):
+        """pdfminer device that only counts glyphs and image area (no layout objects)"""
+        
+        def begin_page(self, page, ctm):
+            self.chars = 0
+            self.image_area = 0.0
+            self.set_ctm(ctm)
+        
+        def render_string(self, textstate, seq, ncs, graphicstate):
+            font = textstate.font
+            if font is None:
+                return
+            for item in seq:
+                if isinstance(item, bytes):
+                    self.chars += len(font.decode(item))
+        
+        def render_image(self, name, stream):
+            # Images are drawn into the unit square, so the CTM gives their area
+            a, b, c, d, _, _ = self.ctm
+            self.image_area += abs(a * d - b * c)
+
+
+    class _TextLineDevice(PDFTextDevice):
+        """
+        pdfminer device that writes text in content-stream order
+        
+        Starts a new line when the baseline moves and inserts a space for wide
+        horizontal gaps, so lines and words stay apart without layout analysis.
+        With top_fraction set, only glyphs in that top share of the page are kept.
+        """
+        
+        def __init__(self, rsrcmgr, top_fraction: Optional[float] = None):
+            super().__init__(rsrcmgr)
+            self.top_fraction = top_fraction
+        
+        def begin_page(self, page, ctm):
+            self.parts = []
+            # (expected x of the next glyph, baseline y, font size) in device space
+            self.cursor = None
+            self.min_y = None
+            if self.top_fraction is not None:
+                x0, y0, x1, y1 = page.mediabox
+                low, high = sorted((apply_matrix_pt(ctm, (x0, y0))[1], apply_matrix_pt(ctm, (x1, y1))[1]))
+                self.min_y = high - (high - low) * self.top_fraction
+            self.set_ctm(ctm)
+        
+        def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+            try:
+                text = font.to_unichr(cid)
+            except PDFUnicodeNotDefined:
+                text = ''
+            advance = font.char_width(cid) * fontsize * scaling
+            
+            a, b, c, d, x, y = matrix
+            if self.min_y is not None and y < self.min_y:
+                return advance
+            size = fontsize * math.hypot(c, d) or fontsize
+            if self.cursor is not None:
+                next_x, baseline, line_size = self.cursor
+                if abs(y - baseline) > line_size * LINE_BREAK_SHIFT:
+                    self.parts.append('\n')
+                elif (x - next_x > line_size * WORD_GAP and not text.isspace()
+                      and self.parts and not self.parts[-1].isspace()):
+                    self.parts.append(' ')
+            
+            self.parts.append(text)
+            self.cursor = (x + advance * math.hypot(a, b), y, size)
+            return advance
+
+
+def _page_inventory(pdf_path: str, max_pages: Optional[int] = None) -> Iterator[tuple]:
+    """Yield (page_number, char_count, image_coverage) without building character objects"""
+    resource_manager = PDFResourceManager()
+    device = _PageInventoryDevice(resource_manager)
+    interpreter = PDFPageInterpreter(resource_manager, device)
+    
+    with open(pdf_path, 'rb') as f:
+        for page_number, page in enumerate(PDFPage.get_pages(f, maxpages=max_pages or 0), start=1):
+            interpreter.process_page(page)
+            x0, y0, x1, y1 = page.cropbox
+            page_area = abs((x1 - x0) * (y1 - y0))
+            coverage = min(1.0, device.image_area / page_area) if page_area else 0.0
+            yield page_number, device.chars, coverage
+
+
+def _page_type(char_count: int, coverage: float, min_chars: int) -> str:
+    if char_count >= min_chars:
+        return 'mixed' if coverage >= MIXED_MIN_COVERAGE else 'text'
+    return 'scanned' if coverage >= SCANNED_MIN_COVERAGE else 'blank'
+
+
+def image_coverage(page) -> float:
+    """Share of the page area covered by embedded images (overlaps counted once per image)"""
+    x0, top, x1, bottom = page.bbox
+    page_area = (x1 - x0) * (bottom - top)
+    if page_area <= 0:
+        return 0.0
+    
+    covered = 0.0
+    for image in page.images:
+        width = min(image['x1'], x1) - max(image['x0'], x0)
+        height = min(image['bottom'], bottom) - max(image['top'], top)
+        if width > 0 and height > 0:
+            covered += width * height
+    return min(1.0, covered / page_area)
+
+
+def classify_page(page, min_chars: int = PAGE_TEXT_MIN_CHARS,
+                  chars: Optional[List[Dict]] = None) -> str:
+    """
+    Classify a pdfplumber page from its embedded characters and images
+    
+    No layout analysis or text extraction is run.
+    
+    Args:
+        page: pdfplumber page
+        min_chars: Embedded characters a page needs to count as having text
+        chars: Characters to count instead of page.chars (e.g. the body region only)
+    
+    Returns:
+        'text' (usable text layer), 'mixed' (text layer plus large images),
+        'scanned' (images but no usable text layer, needs OCR) or 'blank'
+    """
+    coverage = image_coverage(page) if page.images else 0.0
+    return _page_type(len(page.chars if chars is None else chars), coverage, min_chars)
+
+
+def text_layer_map(pdf_path: str, min_chars: int = PAGE_TEXT_MIN_CHARS,
+                   max_pages: Optional[int] = None) -> Dict[int, str]:
+    """
+    Classify every page of a PDF for routing between text extraction and OCR
+    
+    Args:
+        pdf_path: Path to PDF file
+        min_chars: Embedded characters a page needs to count as having text
+        max_pages: Only classify the first pages (default: all)
+    
+    Returns:
+        Mapping of page number (1-indexed) to 'text', 'mixed', 'scanned' or 'blank'
+    """
+    if PDFMINER_AVAILABLE:
+        return {page_number: _page_type(char_count, coverage, min_chars)
+                for page_number, char_count, coverage in _page_inventory(pdf_path, max_pages)}
+    
+    page_types = {}
+    with pdfplumber.open(pdf_path) as pdf:
+        pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
+        for page in pages:
+            page_types[page.page_number] = classify_page(page, min_chars)
+            page.close()
+    return page_types
+
+
+register_backend(DeepDocBackend())
+register_backend(PdfplumberBackend())
+register_backend(PdfminerBackend())
+register_backend(PdfiumBackend())
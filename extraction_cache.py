@@ -0,0 +1,197 @@
+"""
+Persistent Extraction Cache Module
+Stores extracted pages, chapters and AI analysis on disk, keyed by PDF content
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'read-me-book' / 'extraction'
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024  # 512 MB
+
+
+class ExtractionCache:
+    """
+    Content-addressed on-disk cache for PDF extraction results
+    Entries are evicted least-recently-used first once the size limit is exceeded
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_size_bytes: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize extraction cache
+        
+        Args:
+            cache_dir: Directory for cache entries (default: ~/.cache/read-me-book/extraction)
+            max_size_bytes: Total size limit for all entries
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_size_bytes = max_size_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._hash_index_path = self.cache_dir / 'file_hashes.json'
+        # Running total of entry sizes; None until the directory has been scanned
+        self._total_size = None
+        # Directory mtime after our last write, to notice other processes' writes
+        self._seen_mtime = None
+    
+    def make_key(self, pdf_path: str, settings: Dict) -> str:
+        """
+        Build cache key from the PDF content hash and extractor settings
+        
+        Args:
+            pdf_path: Path to PDF file
+            settings: Extractor settings that affect the result
+        
+        Returns:
+            Hex digest identifying the entry
+        """
+        settings_blob = json.dumps(settings, sort_keys=True)
+        key_source = f"{self.file_hash(pdf_path)}:{settings_blob}"
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+    
+    def file_hash(self, pdf_path: str) -> str:
+        """
+        SHA-256 of the file contents
+        Remembered per (path, size, mtime) so unchanged files are not re-read
+        """
+        stat = os.stat(pdf_path)
+        stat_key = f"{os.path.abspath(pdf_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        
+        index = self._load_hash_index()
+        if stat_key in index:
+            return index[stat_key]
+        
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        
+        # Forget hashes of earlier versions of the same file
+        path_prefix = f"{os.path.abspath(pdf_path)}|"
+        index = {k: v for k, v in index.items() if not k.startswith(path_prefix)}
+        index[stat_key] = digest.hexdigest()
+        self._save_hash_index(index)
+        return index[stat_key]
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Load a cached entry
+        
+        Args:
+            key: Key from make_key()
+        
+        Returns:
+            Cached data, or None if missing or unreadable
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with gzip.open(entry_path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        # Touch entry so it counts as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        
+        return data
+    
+    def put(self, key: str, data: Dict):
+        """
+        Store an entry and evict old entries if over the size limit
+        
+        Args:
+            key: Key from make_key() (or any hex digest)
+            data: JSON-serializable data (pages, chapters, analysis)
+        """
+        entry_path = self._entry_path(key)
+        
+        # Other processes (parallel workers, a second app window) write to the same
+        # directory; once it changed behind our back the running total is stale
+        if self._total_size is not None and self._dir_mtime() != self._seen_mtime:
+            self._total_size = None
+        
+        # Write atomically so a crash never leaves a truncated entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8', compresslevel=3) as f:
+                json.dump(data, f, ensure_ascii=False)
+            entry_size = os.path.getsize(tmp_path)
+            try:
+                replaced_size = os.path.getsize(entry_path)
+            except FileNotFoundError:
+                replaced_size = 0
+            os.replace(tmp_path, entry_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        # Only rescan the directory when the running total says we may be over the limit
+        if self._total_size is not None:
+            self._total_size += entry_size - replaced_size
+        if self._total_size is None or self._total_size > self.max_size_bytes:
+            self._evict()
+        self._seen_mtime = self._dir_mtime()
+    
+    def clear(self):
+        """Remove all cache entries"""
+        for entry_path in self.cache_dir.glob('*.json.gz'):
+            entry_path.unlink()
+        if self._hash_index_path.exists():
+            self._hash_index_path.unlink()
+        self._total_size = 0
+        self._seen_mtime = self._dir_mtime()
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json.gz"
+    
+    def _dir_mtime(self) -> Optional[int]:
+        try:
+            return self.cache_dir.stat().st_mtime_ns
+        except OSError:
+            return None
+    
+    def _evict(self):
+        """Delete least recently used entries until the cache fits its size limit"""
+        entries = []
+        total_size = 0
+        for entry_path in self.cache_dir.glob('*.json.gz'):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_size += stat.st_size
+        
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total_size <= self.max_size_bytes:
+                break
+            try:
+                entry_path.unlink()
+                total_size -= size
+            except OSError:
+                pass
+        
+        self._total_size = total_size
+    
+    def _load_hash_index(self) -> Dict[str, str]:
+        try:
+            with open(self._hash_index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_hash_index(self, index: Dict[str, str]):
+        try:
+            with open(self._hash_index_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+        except OSError:
+            pass
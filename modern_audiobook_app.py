@@ -17,6 +17,7 @@ except ImportError:
     MODERN_UI = False
 
 from pdf_processor import PDFProcessor
+from extraction_cache import ExtractionCache
 from tts_engine import TTSEngine
 
 
@@ -30,6 +31,12 @@ class ModernAudiobookApp:
         
         # Application state
         self.pdf_processor = None
+        try:
+            self.extraction_cache = ExtractionCache()
+        except OSError as e:
+            # Unwritable cache directory: run without the cache
+            print(f"Note: extraction cache unavailable: {e}")
+            self.extraction_cache = None
         self.tts_engine = TTSEngine()
         self.current_chapter = 0
         self.is_reading = False
@@ -335,7 +342,7 @@ class ModernAudiobookApp:
         """Load PDF in background thread"""
         try:
             # Create processor with AI enabled
-            self.pdf_processor = PDFProcessor(filename, use_ai=True)
+            self.pdf_processor = PDFProcessor(filename, use_ai=True, cache=self.extraction_cache)
             self.pdf_processor.extract_text()
             chapters = self.pdf_processor.detect_chapters()
             
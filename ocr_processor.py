@@ -2,14 +2,28 @@
 OCR Module for Scanned PDFs
 Uses Tesseract OCR for text extraction from images
 """
+import copy
+import glob
+import hashlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
-from typing import List, Dict, Optional, TYPE_CHECKING
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, List, Dict, Iterator, Optional, Sequence, Tuple, TYPE_CHECKING
 
 try:
     import pytesseract
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     from PIL import Image
     OCR_AVAILABLE = True
 except ImportError:
@@ -18,20 +32,436 @@ except ImportError:
     if TYPE_CHECKING:
         from PIL import Image
 
+# pypdf writes searchable PDFs (original pages plus an OCR text layer)
+try:
+    from pypdf import PdfReader, PdfWriter, Transformation
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+# NumPy powers the image preprocessing pipeline
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Optional in-process Tesseract bindings (no subprocess per page). Imported on
+# first use (see _import_tesserocr): libtesseract's OpenMP runtime reads
+# OMP_THREAD_LIMIT when it loads, so pool workers must set it beforehand
+TESSEROCR_AVAILABLE = importlib.util.find_spec('tesserocr') is not None
+tesserocr = None
+
 from pathlib import Path
 
+from extraction_cache import ExtractionCache
+
+
+# Default resident-memory budget for rendered page images
+DEFAULT_RENDER_BUDGET_MB = 256
+# Page size assumed when pdfinfo does not report one (US letter, in points)
+DEFAULT_PAGE_SIZE = (612.0, 792.0)
+
+# Adaptive DPI: first pass resolution and confidence below which a page is re-run
+DEFAULT_LOW_DPI = 200
+DEFAULT_CONFIDENCE_THRESHOLD = 70.0
+
+# Tesseract page segmentation mode (1 = automatic with orientation detection)
+DEFAULT_PSM = 1
+# Bump whenever _preprocess_image changes its output so cached OCR results are not reused
+PREPROCESSING_VERSION = 2
+
+# Preprocessing steps, in the order they run
+PREPROCESSING_STEPS = ('remove_border', 'deskew', 'downscale', 'binarize')
+# Opt-in: the steps change OCR output, so by default only grayscale conversion runs
+DEFAULT_PREPROCESSING = ()
+# Tesseract is most accurate (and no faster) above roughly this x-height in pixels
+DEFAULT_TARGET_X_HEIGHT = 24
+# Rows/columns at the page edge with more ink than this are scanner borders
+BORDER_DARK_FRACTION = 0.5
+# Space kept around the detected text block, as a fraction of the page size
+CONTENT_PADDING = 0.01
+# Deskew search range and precision, in degrees
+MAX_SKEW_ANGLE = 5.0
+SKEW_STEP = 0.1
+# Sauvola window (pixels) and sensitivity
+SAUVOLA_WINDOW = 25
+SAUVOLA_K = 0.2
+# Suggested location for a persistent per-page OCR cache
+DEFAULT_OCR_CACHE_DIR = Path.home() / '.cache' / 'read-me-book' / 'ocr'
+
+# Blank / image-only page detection on the rendered page, before OCR
+# Ink and paper levels come from the page's own Otsu split, so dim or tinted
+# paper is measured against itself rather than against fixed gray levels
+BLANK_SAMPLE_STRIDE = 2      # check every 2nd pixel in each direction
+MIN_INK_CONTRAST = 48        # ink must be this much darker than the paper
+IMAGE_MIDTONE_SHARE = 0.35   # photos and plates are dominated by tones between ink and paper
+IMAGE_INK_DENSITY = 0.5      # text never covers half the page
+LINE_MIN_INK = 2             # sampled ink pixels above the typical row that mark a text row
+LINE_MIN_HEIGHT = 0.002      # text-line height range, as a fraction of the page height
+LINE_MAX_HEIGHT = 0.1
+LINE_MIN_GLYPHS = 2          # separate ink runs a text line needs (rejects dust and rules)
+
+# Files picked up when OCR'ing a directory of page images
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.gif', '.webp',
+                    '.jp2', '.pbm', '.pgm', '.ppm')
+
+# Checkpoint file format version for resumable OCR jobs
+CHECKPOINT_VERSION = 1
+
+# Per-process OCR processor used by pool workers
+_worker_processor = None
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _otsu_threshold(gray: 'np.ndarray') -> int:
+    """Gray level that maximizes between-class variance"""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256, dtype=np.float64)
+    weight = np.cumsum(hist)
+    mass = np.cumsum(hist * levels)
+    total_weight, total_mass = weight[-1], mass[-1]
+    
+    background = weight[:-1]
+    foreground = total_weight - background
+    valid = (background > 0) & (foreground > 0)
+    if not valid.any():
+        return 128
+    mean_bg = np.where(valid, mass[:-1] / np.maximum(background, 1), 0)
+    mean_fg = np.where(valid, (total_mass - mass[:-1]) / np.maximum(foreground, 1), 0)
+    variance = np.where(valid, background * foreground * (mean_bg - mean_fg) ** 2, 0)
+    return int(np.argmax(variance)) + 1
+
+
+def _sauvola_binarize(gray: 'np.ndarray', window: int = SAUVOLA_WINDOW,
+                      k: float = SAUVOLA_K) -> 'np.ndarray':
+    """Local-threshold binarization for unevenly lit scans (integral images, O(1) per pixel)"""
+    window |= 1  # odd, so the window is centred on the pixel
+    height, width = gray.shape
+    padded = np.pad(gray, window // 2, mode='edge')
+    
+    def window_sums(values):
+        # uint32 tables may wrap on large pages, but every window sum fits in
+        # 32 bits, so the wrapped differences are still exact
+        table = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.uint32)
+        np.cumsum(values, axis=0, dtype=np.uint32, out=table[1:, 1:])
+        np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+        sums = table[window:window + height, window:window + width] - table[:height, window:window + width]
+        sums -= table[window:window + height, :width]
+        sums += table[:height, :width]
+        return sums
+    
+    area = window * window
+    mean = window_sums(padded).astype(np.float32)
+    mean /= area
+    
+    squared = padded.astype(np.uint32)
+    del padded
+    squared *= squared
+    std = window_sums(squared).astype(np.float32)
+    del squared
+    
+    # std = sqrt(E[x^2] - mean^2), then threshold = mean * (1 + k * (std / 128 - 1)), in place
+    std /= area
+    std -= mean * mean
+    np.maximum(std, 0, out=std)
+    np.sqrt(std, out=std)
+    std *= k / 128.0
+    std += 1 - k
+    std *= mean
+    return np.where(gray > std, 255, 0).astype(np.uint8)
+
+
+def _page_content_type(gray: 'np.ndarray') -> str:
+    """
+    Classify a rendered grayscale page as 'blank', 'image' or 'text'
+    
+    Works on a subsampled copy. Text pages are nearly bimodal (paper and ink),
+    so tones between the page's own ink and paper levels mark photos and
+    plates. A page only counts as blank when no text-line run is found, so a
+    single heading on an otherwise empty page is still OCR'd.
+    """
+    sample = gray[::BLANK_SAMPLE_STRIDE, ::BLANK_SAMPLE_STRIDE]
+    if sample.size == 0:
+        return 'blank'
+    
+    dark = sample < _otsu_threshold(sample)
+    ink_count = np.count_nonzero(dark)
+    if ink_count == 0 or ink_count == sample.size:
+        return 'blank'
+    
+    ink_level = float(sample[dark].mean())
+    paper_level = float(sample[~dark].mean())
+    contrast = paper_level - ink_level
+    if contrast < MIN_INK_CONTRAST:
+        # Paper texture or a solid sheet: Otsu only split the noise
+        return 'blank'
+    
+    margin = contrast / 4
+    midtones = np.count_nonzero((sample > ink_level + margin) & (sample < paper_level - margin))
+    if midtones / sample.size > IMAGE_MIDTONE_SHARE or ink_count / sample.size > IMAGE_INK_DENSITY:
+        return 'image'
+    
+    return 'text' if _has_text_line(dark) else 'blank'
+
+
+def _has_text_line(dark: 'np.ndarray') -> bool:
+    """Check an ink mask for a band of rows with line height and several separate ink runs"""
+    rows = np.count_nonzero(dark, axis=1)
+    inked = rows > np.median(rows) + LINE_MIN_INK
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], inked.view(np.int8), [0]))))
+    
+    min_height = max(2, int(dark.shape[0] * LINE_MIN_HEIGHT))
+    max_height = int(dark.shape[0] * LINE_MAX_HEIGHT)
+    for top, bottom in zip(edges[::2], edges[1::2]):
+        if not min_height <= bottom - top <= max_height:
+            continue
+        columns = dark[top:bottom].any(axis=0).view(np.int8)
+        glyph_runs = np.count_nonzero(np.diff(columns) == 1) + columns[0]
+        if glyph_runs >= LINE_MIN_GLYPHS:
+            return True
+    return False
+
+
+def _parse_tsv(tsv: str) -> Dict[str, list]:
+    """Convert tesseract TSV output to image_to_data's DICT layout"""
+    rows = [line.split('\t') for line in tsv.splitlines() if line]
+    if not rows:
+        return {key: [] for key in ('text', 'conf', 'block_num', 'par_num', 'line_num',
+                                    'left', 'top', 'width', 'height')}
+    header = rows[0]
+    data = {key: [] for key in header}
+    for row in rows[1:]:
+        row = row + [''] * (len(header) - len(row))
+        for key, value in zip(header, row):
+            if key == 'text':
+                data[key].append(value)
+            elif key == 'conf':
+                data[key].append(float(value or -1))
+            else:
+                data[key].append(int(value or 0))
+    return data
+
+
+def _content_box(ink: 'np.ndarray') -> Optional[Tuple[int, int, int, int]]:
+    """
+    Bounding box (top, bottom, left, right) of the text block, excluding dark
+    scanner borders along the page edges
+    
+    Returns None when the page has no ink.
+    """
+    height, width = ink.shape
+    row_ink = ink.mean(axis=1)
+    col_ink = ink.mean(axis=0)
+    
+    def edge_band(profile):
+        # Length of the run of dark rows/columns touching the edge
+        clear = profile <= BORDER_DARK_FRACTION
+        return int(np.argmax(clear)) if clear.any() else len(profile)
+    
+    top = edge_band(row_ink)
+    bottom = height - edge_band(row_ink[::-1])
+    left = edge_band(col_ink)
+    right = width - edge_band(col_ink[::-1])
+    if top >= bottom or left >= right:
+        return None
+    
+    inner = ink[top:bottom, left:right]
+    rows = np.flatnonzero(inner.any(axis=1))
+    cols = np.flatnonzero(inner.any(axis=0))
+    if not len(rows):
+        return None
+    
+    pad_y = int(height * CONTENT_PADDING)
+    pad_x = int(width * CONTENT_PADDING)
+    return (max(top, top + int(rows[0]) - pad_y), min(bottom, top + int(rows[-1]) + 1 + pad_y),
+            max(left, left + int(cols[0]) - pad_x), min(right, left + int(cols[-1]) + 1 + pad_x))
+
+
+def _estimate_skew(ink: 'np.ndarray', max_angle: float = MAX_SKEW_ANGLE,
+                   step: float = SKEW_STEP) -> float:
+    """
+    Text skew in degrees (positive = lines rise to the right)
+    
+    Projects ink pixels along every candidate angle at once and picks the angle
+    whose row histogram is sharpest (text lines collapse into narrow peaks).
+    """
+    # Work on a subsampled mask; the angle does not need full resolution
+    stride = max(1, ink.shape[1] // 800)
+    ys, xs = np.nonzero(ink[::stride, ::stride])
+    if len(ys) < 100:
+        return 0.0
+    
+    def best_angle(angles):
+        shifts = np.tan(np.radians(angles))[:, None] * xs[None, :]
+        bins = np.round(ys[None, :] + shifts).astype(np.int64)
+        bins -= bins.min()
+        n_bins = int(bins.max()) + 1
+        bins += np.arange(len(angles))[:, None] * n_bins
+        hist = np.bincount(bins.ravel(), minlength=len(angles) * n_bins).reshape(len(angles), n_bins)
+        return float(angles[np.argmax((hist.astype(np.float64) ** 2).sum(axis=1))])
+    
+    # Coarse search over the full range, then refine around the best coarse angle
+    coarse = best_angle(np.arange(-max_angle, max_angle + 0.5, 0.5))
+    return best_angle(np.arange(coarse - 0.5, coarse + 0.5 + step / 2, step))
+
+
+def _estimate_x_height(ink: 'np.ndarray') -> Optional[float]:
+    """
+    Median x-height of the text lines, in pixels
+    
+    Each text line shows up as a run of inked rows; its densest rows (at least
+    half the line's peak ink) form the x-height band between baseline and mean line.
+    """
+    profile = ink.sum(axis=1).astype(np.float64)
+    # Ink present on every row (vertical rules, leftover borders) is not text
+    profile -= profile.min()
+    inked = profile > 0
+    if not inked.any():
+        return None
+    
+    edges = np.diff(np.concatenate(([0], inked.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    lengths = ends - starts
+    lines = lengths >= 3
+    # A handful of runs is more likely a figure or border than a text block
+    if lines.sum() < 3:
+        return None
+    starts, lengths = starts[lines], lengths[lines]
+    
+    rows = np.concatenate([np.arange(start, start + length) for start, length in zip(starts, lengths)])
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    peaks = np.maximum.reduceat(profile[rows], offsets)
+    core = profile[rows] >= np.repeat(peaks, lengths) * 0.5
+    return float(np.median(np.add.reduceat(core.astype(np.int64), offsets)))
+
+
+def _unrotate_box(box: Tuple[float, float, float, float], angle: float,
+                  rotated_size: Tuple[int, int], original_size: Tuple[int, int]) -> Tuple[float, float, float, float]:
+    """
+    Map a (left, top, right, bottom) box from a deskewed image (rotated by -angle
+    with expand=True) back to the image before rotation
+    
+    Returns the axis-aligned bounding box of the rotated corners, clipped to the image.
+    """
+    theta = np.radians(-angle)
+    cos, sin = np.cos(theta), np.sin(theta)
+    left, top, right, bottom = box
+    xs = np.array([left, right, left, right]) - rotated_size[0] / 2
+    ys = np.array([top, top, bottom, bottom]) - rotated_size[1] / 2
+    x = xs * cos - ys * sin + original_size[0] / 2
+    y = xs * sin + ys * cos + original_size[1] / 2
+    return (max(0.0, x.min()), max(0.0, y.min()),
+            min(float(original_size[0]), x.max()), min(float(original_size[1]), y.max()))
+
+
+# Per-process tesserocr API handles, keyed by (language, psm); each loads its
+# language data once and is reused for every page this process OCRs
+_tesserocr_apis = {}
+
+
+def _import_tesserocr():
+    """Import tesserocr into this process (loads libtesseract and its OpenMP runtime)"""
+    global tesserocr
+    if tesserocr is None:
+        try:
+            import tesserocr
+        except ImportError as e:
+            raise RuntimeError(f"tesserocr could not be imported: {e}")
+    return tesserocr
+
+
+def _get_tesserocr_api(language: str, psm: int):
+    """Return this process's tesserocr handle for the language, creating it once"""
+    _import_tesserocr()
+    key = (language, psm)
+    if key not in _tesserocr_apis:
+        _tesserocr_apis[key] = tesserocr.PyTessBaseAPI(lang=language, psm=psm)
+    return _tesserocr_apis[key]
+
+
+def _init_ocr_worker(processor: 'OCRProcessor', omp_threads: int):
+    """Pool initializer: cap Tesseract threads and keep one processor per worker"""
+    global _worker_processor
+    # Inherited by every tesseract subprocess this worker spawns, and read by
+    # OpenMP when tesserocr is first imported in this worker
+    os.environ['OMP_THREAD_LIMIT'] = str(omp_threads)
+    _worker_processor = processor
+
+
+def _ocr_image_frame(path: str, frame: int, page_number: int) -> Dict:
+    """Decode and OCR one image (or one frame of a multipage file) inside a pool worker"""
+    return _worker_processor._ocr_image_frame(path, frame, page_number)
+
+
+def _natural_sort_key(path: str) -> List:
+    """Sort key that orders page2.jpg before page10.jpg"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', path)]
+
+
+def _ocr_pdf_page(pdf_path: str, page_number: int, text_layer: bool = False) -> Dict:
+    """Render and OCR a single PDF page inside a pool worker"""
+    processor = _worker_processor
+    
+    def render(dpi: int):
+        return processor._render_pages(pdf_path, page_number, page_number, dpi=dpi)[0]
+    
+    return processor.ocr_rendered_page(render, page_number, text_layer=text_layer)
+
 
 class OCRProcessor:
     """
     OCR processor for extracting text from scanned PDFs
     """
     
-    def __init__(self, language: str = 'eng'):
+    def __init__(self, language: str = 'eng', workers: int = 1,
+                 max_in_flight: Optional[int] = None, keep_word_boxes: bool = False,
+                 max_resident_mb: int = DEFAULT_RENDER_BUDGET_MB,
+                 scratch_dir: Optional[str] = None, adaptive_dpi: bool = False,
+                 low_dpi: int = DEFAULT_LOW_DPI,
+                 confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+                 cache: Optional[ExtractionCache] = None, engine: str = 'auto',
+                 preprocessing: Sequence[str] = DEFAULT_PREPROCESSING,
+                 binarization: str = 'otsu',
+                 target_x_height: int = DEFAULT_TARGET_X_HEIGHT,
+                 record_timings: bool = False, skip_blank_pages: bool = False):
         """
         Initialize OCR processor
         
         Args:
             language: Tesseract language code (eng, por, spa, etc.)
+            workers: OCR worker processes for PDFs (1 = serial, None = all cores)
+            max_in_flight: Maximum pages queued or being OCR'd at once (default: 2 per worker)
+            keep_word_boxes: Include per-word text, confidence and bounding boxes in page records
+            max_resident_mb: Memory budget for rendered page images held at once
+            scratch_dir: Render pages to files in this directory (e.g. a tmpfs such as
+                /dev/shm) and load them one at a time instead of keeping batches in RAM
+            adaptive_dpi: OCR at low_dpi first and re-render at full DPI only pages
+                whose confidence is below confidence_threshold
+            low_dpi: First-pass DPI in adaptive mode
+            confidence_threshold: Page confidence (0-100) that triggers a full-DPI re-run
+            cache: Persistent per-page result cache, keyed by the rendered bitmap and
+                OCR settings (e.g. ExtractionCache(DEFAULT_OCR_CACHE_DIR))
+            engine: 'tesserocr' (in-process, language data loaded once per process),
+                'pytesseract' (one tesseract subprocess per page) or 'auto' (tesserocr
+                when installed, otherwise pytesseract)
+            preprocessing: Steps to run before OCR, any of PREPROCESSING_STEPS
+                (always applied in that order; grayscale conversion always runs).
+                None by default, e.g. ('remove_border', 'binarize') for scans
+            binarization: 'otsu' (global threshold) or 'sauvola' (local threshold)
+            target_x_height: x-height in pixels the 'downscale' step shrinks text to
+            record_timings: Add per-step preprocessing and Tesseract times to page records
+            skip_blank_pages: Skip OCR for blank and image-only pages (plates, separator
+                sheets); their records get empty text and 'ocr_skipped' set to the reason.
+                Off by default: a misclassified page loses its text
         """
         if not OCR_AVAILABLE:
             raise ImportError(
@@ -42,10 +472,25 @@ class OCRProcessor:
         
         self.language = language
         self.dpi = 300  # Higher DPI for better OCR quality
+        self.psm = DEFAULT_PSM
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.keep_word_boxes = keep_word_boxes
+        self.max_resident_mb = max_resident_mb
+        self.scratch_dir = scratch_dir
+        self.adaptive_dpi = adaptive_dpi
+        self.low_dpi = low_dpi
+        self.confidence_threshold = confidence_threshold
+        self.cache = cache
+        self.engine = self._resolve_engine(engine)
+        self.set_preprocessing(preprocessing, binarization, target_x_height)
+        self.record_timings = record_timings
+        self.skip_blank_pages = skip_blank_pages and NUMPY_AVAILABLE
     
     def extract_text_from_pdf(self, pdf_path: str, 
                               start_page: Optional[int] = None,
-                              end_page: Optional[int] = None) -> List[Dict]:
+                              end_page: Optional[int] = None,
+                              checkpoint_path: Optional[str] = None) -> List[Dict]:
         """
         Extract text from scanned PDF using OCR
         
@@ -53,106 +498,857 @@ class OCRProcessor:
             pdf_path: Path to PDF file
             start_page: First page to process (1-indexed)
             end_page: Last page to process (1-indexed)
+            checkpoint_path: JSONL checkpoint file; see iter_text_from_pdf()
             
         Returns:
             List of dictionaries with page number and extracted text
         """
-        pages_data = []
-        
         try:
-            # Convert PDF pages to images
-            images = convert_from_path(
+            return list(self.iter_text_from_pdf(pdf_path, start_page, end_page, checkpoint_path))
+        except Exception as e:
+            raise RuntimeError(f"OCR processing failed: {str(e)}")
+    
+    def iter_text_from_pdf(self, pdf_path: str,
+                           start_page: Optional[int] = None,
+                           end_page: Optional[int] = None,
+                           checkpoint_path: Optional[str] = None,
+                           progress_callback: Optional[Callable[[int, int], None]] = None) -> Iterator[Dict]:
+        """
+        Yield OCR results page by page, in page order
+        
+        Args:
+            pdf_path: Path to PDF file
+            start_page: First page to process (1-indexed)
+            end_page: Last page to process (1-indexed)
+            checkpoint_path: Job mode: append every finished page to this JSONL file
+                and, on a later run with the same PDF and settings, resume after the
+                last completed page instead of starting over
+            progress_callback: Called as progress_callback(pages_done, total_pages)
+                after each page (job mode only)
+            
+        Yields:
+            Dictionaries with page number, extracted text and OCR confidence
+        """
+        if checkpoint_path:
+            yield from self._iter_checkpointed(pdf_path, checkpoint_path, start_page,
+                                               end_page, progress_callback)
+            return
+        
+        if self.workers > 1:
+            yield from self._iter_text_parallel(pdf_path, start_page, end_page)
+            return
+        
+        # Render pages in small batches and OCR each image as it arrives
+        for page_number, image in self._iter_rendered_pages(pdf_path, start_page, end_page):
+            def render(dpi: int, page_number=page_number):
+                return self._render_pages(pdf_path, page_number, page_number, dpi=dpi)[0]
+            
+            yield self.ocr_rendered_page(render, page_number, image)
+    
+    def _iter_rendered_pages(self, pdf_path: str,
+                             start_page: Optional[int] = None,
+                             end_page: Optional[int] = None) -> Iterator[Tuple[int, 'Image']]:
+        """
+        Render pages lazily, in grayscale, within the resident-memory budget
+        
+        Each image is closed once the consumer moves on to the next page.
+        """
+        info = pdfinfo_from_path(pdf_path)
+        first_page = start_page or 1
+        last_page = end_page or info['Pages']
+        dpi = self._first_pass_dpi()
+        batch_size = self._render_batch_size(info, dpi)
+        
+        scratch = tempfile.TemporaryDirectory(dir=self.scratch_dir) if self.scratch_dir else nullcontext()
+        with scratch as output_folder:
+            for batch_first in range(first_page, last_page + 1, batch_size):
+                batch_last = min(batch_first + batch_size - 1, last_page)
+                rendered = self._render_pages(pdf_path, batch_first, batch_last, output_folder, dpi)
+                
+                for page_number in range(batch_first, batch_last + 1):
+                    if not rendered:
+                        break
+                    item = rendered.pop(0)
+                    image = Image.open(item) if output_folder else item
+                    try:
+                        yield page_number, image
+                    finally:
+                        image.close()
+                        if output_folder:
+                            os.remove(item)
+    
+    def _render_pages(self, pdf_path: str, first_page: int, last_page: int,
+                      output_folder: Optional[str] = None, dpi: Optional[int] = None) -> List:
+        """
+        Render a page range in grayscale
+        
+        Returns:
+            PIL images, or file paths when rendering to an output folder
+        """
+        dpi = dpi or self.dpi
+        if output_folder:
+            return convert_from_path(
                 pdf_path,
-                dpi=self.dpi,
-                first_page=start_page,
-                last_page=end_page
+                dpi=dpi,
+                first_page=first_page,
+                last_page=last_page,
+                grayscale=True,
+                output_folder=output_folder,
+                paths_only=True
             )
+        
+        return convert_from_path(
+            pdf_path,
+            dpi=dpi,
+            first_page=first_page,
+            last_page=last_page,
+            grayscale=True
+        )
+    
+    def _render_batch_size(self, pdf_info: Dict, dpi: int) -> int:
+        """Pages to render per batch so grayscale images stay within max_resident_mb"""
+        width, height = DEFAULT_PAGE_SIZE
+        match = re.match(r'\s*([\d.]+)\s*x\s*([\d.]+)', str(pdf_info.get('Page size', '')))
+        if match:
+            width, height = float(match.group(1)), float(match.group(2))
+        
+        # One byte per pixel in grayscale; page size is in points (1/72 inch)
+        bytes_per_page = (width / 72 * dpi) * (height / 72 * dpi)
+        budget = self.max_resident_mb * 1024 * 1024
+        return max(1, int(budget // bytes_per_page))
+    
+    def _iter_text_parallel(self, pdf_path: str,
+                            start_page: Optional[int] = None,
+                            end_page: Optional[int] = None,
+                            page_numbers: Optional[List[int]] = None,
+                            text_layer: bool = False) -> Iterator[Dict]:
+        """
+        OCR pages in a process pool; each worker renders its own pages
+        
+        At most max_in_flight pages are queued at once, and Tesseract's own
+        threading is limited so workers x threads does not exceed the core count.
+        """
+        if page_numbers is None:
+            first_page = start_page or 1
+            last_page = end_page or pdfinfo_from_path(pdf_path)['Pages']
+            page_numbers = range(first_page, last_page + 1)
+        
+        tasks = ((pdf_path, page_number, text_layer) for page_number in page_numbers)
+        yield from self._iter_in_pool(_ocr_pdf_page, tasks)
+    
+    def _iter_in_pool(self, func: Callable, tasks: Iterator[tuple]) -> Iterator[Dict]:
+        """
+        Run func(*args) for each task in worker processes, yielding results in task order
+        
+        Tasks are consumed lazily so no more than max_in_flight are queued at once.
+        """
+        worker_processor = copy.copy(self)
+        worker_processor.workers = 1
+        omp_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        # Forked workers would inherit an OpenMP runtime that already read its
+        # thread limit, so start fresh interpreters once libtesseract is loaded here
+        context = multiprocessing.get_context('spawn') if tesserocr is not None else None
+        
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                 initializer=_init_ocr_worker,
+                                 initargs=(worker_processor, omp_threads)) as executor:
+            pending = deque()
+            tasks = iter(tasks)
+            next_task = next(tasks, None)
+            while next_task is not None or pending:
+                while next_task is not None and len(pending) < self.max_in_flight:
+                    pending.append(executor.submit(func, *next_task))
+                    next_task = next(tasks, None)
+                
+                yield pending.popleft().result()
+    
+    def _iter_checkpointed(self, pdf_path: str, checkpoint_path: str,
+                           start_page: Optional[int] = None,
+                           end_page: Optional[int] = None,
+                           progress_callback: Optional[Callable[[int, int], None]] = None) -> Iterator[Dict]:
+        """
+        Run OCR as a resumable job backed by a JSONL checkpoint
+        
+        The first line records the PDF's content hash and the OCR settings; each
+        following line is one finished page record, flushed to disk before the
+        page is yielded. Completed pages are replayed from the file on restart.
+        """
+        first_page = start_page or 1
+        last_page = end_page or pdfinfo_from_path(pdf_path)['Pages']
+        total = last_page - first_page + 1
+        header = {
+            'checkpoint_version': CHECKPOINT_VERSION,
+            'pdf_sha256': _file_sha256(pdf_path),
+            'settings': self._job_settings()
+        }
+        
+        completed = self._load_checkpoint(checkpoint_path, header)
+        resuming = completed is not None
+        completed = completed or {}
+        resume_page = first_page
+        while resume_page in completed and resume_page <= last_page:
+            resume_page += 1
+        
+        done = 0
+        for page_number in range(first_page, resume_page):
+            done += 1
+            if progress_callback:
+                progress_callback(done, total)
+            yield completed[page_number]
+        if resume_page > last_page:
+            return
+        
+        mode = 'a' if resuming else 'w'
+        with open(checkpoint_path, mode, encoding='utf-8') as f:
+            if mode == 'w':
+                f.write(json.dumps(header) + '\n')
             
-            # Process each image with OCR
-            for i, image in enumerate(images, start=start_page or 1):
-                text = self._extract_text_from_image(image)
+            for page_data in self.iter_text_from_pdf(pdf_path, resume_page, last_page):
+                f.write(json.dumps(page_data, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
                 
-                pages_data.append({
-                    'page_number': i,
-                    'text': text,
-                    'ocr_confidence': self._get_ocr_confidence(image)
-                })
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total)
+                yield page_data
+    
+    def _load_checkpoint(self, checkpoint_path: str, header: Dict) -> Optional[Dict[int, Dict]]:
+        """
+        Read completed pages from a checkpoint
         
-        except Exception as e:
-            raise RuntimeError(f"OCR processing failed: {str(e)}")
+        Returns:
+            Page records by page number, or None when there is no usable checkpoint
+            for this PDF and these settings (the job then starts from scratch).
+            A partially written last line from a crash is cut off.
+        """
+        try:
+            f = open(checkpoint_path, 'rb+')
+        except OSError:
+            return None
         
-        return pages_data
+        with f:
+            try:
+                if json.loads(f.readline()) != header:
+                    return None
+            except ValueError:
+                return None
+            
+            pages = {}
+            valid_end = f.tell()
+            for line in iter(f.readline, b''):
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    page_data = json.loads(line)
+                except ValueError:
+                    break
+                pages[page_data['page_number']] = page_data
+                valid_end = f.tell()
+            f.truncate(valid_end)
+        
+        return pages
     
-    def _extract_text_from_image(self, image) -> str:
+    def _job_settings(self) -> Dict:
+        """OCR settings that change page results; a checkpoint is only resumed if they match"""
+        return {
+            'language': self.language,
+            'dpi': self.dpi,
+            'psm': self.psm,
+            'preprocessing': [PREPROCESSING_VERSION, list(self.preprocessing),
+                              self.binarization, self.target_x_height],
+            'adaptive_dpi': [self.adaptive_dpi, self.low_dpi, self.confidence_threshold],
+            'skip_blank_pages': self.skip_blank_pages,
+            'keep_word_boxes': self.keep_word_boxes
+        }
+    
+    def write_searchable_pdf(self, pdf_path: str, output_path: str,
+                             start_page: Optional[int] = None,
+                             end_page: Optional[int] = None,
+                             only_scanned: bool = True) -> List[Dict]:
         """
-        Extract text from a single image using Tesseract
+        OCR a scanned PDF and write a copy with an invisible text layer
+        
+        Pages keep their original content; Tesseract's text-only PDF output is
+        laid over them so the text can be selected and extracted. Opening the
+        result with PDFProcessor then takes the text-layer path instead of OCR.
         
         Args:
-            image: PIL Image object
+            pdf_path: Path to the source PDF
+            output_path: Where to write the searchable PDF
+            start_page: First page to OCR (1-indexed)
+            end_page: Last page to OCR (1-indexed)
+            only_scanned: Only OCR pages without a usable text layer (see text_layer_map)
             
         Returns:
-            Extracted text
+            OCR page records for the pages that were processed
         """
-        # Preprocess image for better OCR
-        processed_image = self._preprocess_image(image)
+        if not PYPDF_AVAILABLE:
+            raise ImportError("Writing searchable PDFs requires pypdf. Install with: pip install pypdf")
         
-        # Extract text
-        text = pytesseract.image_to_string(
-            processed_image,
-            lang=self.language,
-            config='--psm 1'  # Automatic page segmentation
-        )
+        reader = PdfReader(pdf_path)
+        first_page = start_page or 1
+        last_page = end_page or len(reader.pages)
+        page_numbers = list(range(first_page, last_page + 1))
+        if only_scanned:
+            page_types = self.text_layer_map(pdf_path)
+            page_numbers = [n for n in page_numbers if page_types.get(n) == 'scanned']
+        
+        if self.workers > 1:
+            results = self._iter_text_parallel(pdf_path, page_numbers=page_numbers, text_layer=True)
+        else:
+            results = self._iter_page_layers(pdf_path, page_numbers)
+        
+        writer = PdfWriter(clone_from=reader)
+        records = []
+        for page_data in results:
+            layer_pdf = page_data.pop('text_layer', None)
+            transform = page_data.pop('layer_transform', None)
+            # Blank and image-only pages are skipped and get no text layer
+            if layer_pdf:
+                self._merge_text_layer(writer.pages[page_data['page_number'] - 1], layer_pdf, transform)
+            records.append(page_data)
+        
+        # Write next to the target and rename, so a failed run never leaves half a PDF
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            writer.write(f)
+        os.replace(tmp_path, output_path)
         
-        return text
+        return records
     
-    def _preprocess_image(self, image) -> 'Image':
+    def _iter_page_layers(self, pdf_path: str, page_numbers: List[int]) -> Iterator[Dict]:
+        """OCR the given pages one at a time, with text-layer output"""
+        for page_number in page_numbers:
+            def render(dpi: int, page_number=page_number):
+                return self._render_pages(pdf_path, page_number, page_number, dpi=dpi)[0]
+            
+            yield self.ocr_rendered_page(render, page_number, text_layer=True)
+    
+    @staticmethod
+    def _merge_text_layer(page, layer_pdf: bytes, transform: Dict):
+        """
+        Lay a text-only PDF page from Tesseract over the original page
+        
+        The layer matches the preprocessed image, so it is scaled back, rotated
+        back by the deskew angle and moved to the crop origin of the rendered page.
+        """
+        layer = PdfReader(io.BytesIO(layer_pdf)).pages[0]
+        if page.rotation:
+            # pdf2image renders rotated pages upright; do the same for the page content
+            page.transfer_rotation_to_content()
+        
+        box = page.mediabox
+        width_px, height_px = transform['size']
+        crop_width, crop_height = transform['crop_size']
+        rotated_width, rotated_height = transform['rotated_size']
+        left, top = transform['offset']
+        # Layer points -> pixels of the deskewed (not yet downscaled) image
+        to_pixels = transform['layer_dpi'] / 72 / transform['scale']
+        
+        # All steps in PDF orientation (y up) and rendered-page pixels until the last scale
+        placement = (Transformation()
+                     .scale(to_pixels, to_pixels)
+                     .translate(-rotated_width / 2, -rotated_height / 2)
+                     .rotate(transform['angle'])
+                     .translate(crop_width / 2, crop_height / 2)
+                     .translate(left, height_px - top - crop_height)
+                     .scale(float(box.width) / width_px, float(box.height) / height_px)
+                     .translate(float(box.left), float(box.bottom)))
+        page.merge_transformed_page(layer, placement)
+    
+    def _first_pass_dpi(self) -> int:
+        """Resolution used for the first OCR attempt on each page"""
+        if self.adaptive_dpi:
+            return min(self.low_dpi, self.dpi)
+        return self.dpi
+    
+    def ocr_rendered_page(self, render, page_number: int, image=None,
+                          text_layer: bool = False) -> Dict:
         """
-        Preprocess image to improve OCR quality
+        OCR a page, re-rendering at full DPI when adaptive mode finds low confidence
         
         Args:
-            image: Input image
+            render: Callable taking a DPI and returning a PIL Image of the page
+            page_number: Page number (1-indexed)
+            image: Page already rendered at the first-pass DPI (rendered on demand if None)
+            text_layer: Include an invisible-text PDF page (see ocr_page_image)
             
         Returns:
-            Preprocessed image
+            Page dictionary as from ocr_page_image(); in adaptive mode it also
+            records 'ocr_dpi' (resolution of the kept result) and 'dpi_rerun'
+        """
+        first_dpi = self._first_pass_dpi()
+        owns_image = image is None
+        if owns_image:
+            image = render(first_dpi)
+        try:
+            result = self.ocr_page_image(image, page_number, dpi=first_dpi, text_layer=text_layer)
+        finally:
+            if owns_image:
+                image.close()
+        
+        if not self.adaptive_dpi:
+            return result
+        
+        result['ocr_dpi'] = first_dpi
+        result['dpi_rerun'] = False
+        if (result['ocr_confidence'] < self.confidence_threshold and self.dpi > first_dpi
+                and not result.get('ocr_skipped')):
+            full_image = render(self.dpi)
+            try:
+                retry = self.ocr_page_image(full_image, page_number, dpi=self.dpi, text_layer=text_layer)
+            finally:
+                full_image.close()
+            
+            # Keep whichever pass Tesseract was more confident about
+            if retry['ocr_confidence'] >= result['ocr_confidence']:
+                retry['ocr_dpi'] = self.dpi
+                result = retry
+            result['dpi_rerun'] = True
+        
+        return result
+    
+    def ocr_page_image(self, image, page_number: int, dpi: Optional[int] = None,
+                       text_layer: bool = False) -> Dict:
+        """
+        OCR an already rendered page, serving unchanged pages from the cache
+        
+        Args:
+            image: PIL Image of the page
+            page_number: Page number (1-indexed)
+            dpi: Resolution the page was rendered at (part of the cache key)
+            text_layer: Include an invisible-text PDF page ('text_layer') and its
+                placement ('layer_transform'), as used by write_searchable_pdf()
+            
+        Returns:
+            Dictionary with page number, extracted text and OCR confidence
+            (plus word boxes when keep_word_boxes is enabled, and 'ocr_skipped'
+            set to 'blank' or 'image' for pages that were not OCR'd)
+        """
+        if self.skip_blank_pages:
+            start = time.perf_counter()
+            content_type = self.classify_page_image(image)
+            if content_type != 'text':
+                page_data = {
+                    'page_number': page_number,
+                    'text': '',
+                    'ocr_confidence': 0.0,
+                    'ocr_skipped': content_type
+                }
+                if self.keep_word_boxes:
+                    page_data['words'] = []
+                if self.record_timings:
+                    page_data['timings'] = {'blank_check': round(time.perf_counter() - start, 4)}
+                return page_data
+        
+        cache_key = self._page_cache_key(image, dpi) if self.cache is not None else None
+        # Cached entries hold no PDF layer, so text-layer requests always run Tesseract
+        result = self.cache.get(cache_key) if cache_key and not text_layer else None
+        
+        if result is None:
+            result = self._ocr_image(image, dpi, text_layer)
+            if cache_key:
+                try:
+                    self.cache.put(cache_key, {k: v for k, v in result.items()
+                                               if k not in ('timings', 'text_layer', 'layer_transform')})
+                except (OSError, TypeError, ValueError) as e:
+                    print(f"Note: Could not write OCR cache: {e}")
+        
+        page_data = {
+            'page_number': page_number,
+            'text': result['text'],
+            'ocr_confidence': result['confidence']
+        }
+        if self.keep_word_boxes:
+            page_data['words'] = result['words']
+        if result.get('deskew_angle'):
+            page_data['deskew_angle'] = result['deskew_angle']
+        if self.record_timings and 'timings' in result:
+            page_data['timings'] = result['timings']
+        if text_layer:
+            page_data['text_layer'] = result['text_layer']
+            page_data['layer_transform'] = result['layer_transform']
+        
+        return page_data
+    
+    def classify_page_image(self, image) -> str:
+        """
+        Cheap pre-OCR check of a rendered page
+        
+        Args:
+            image: PIL Image of the page
+            
+        Returns:
+            'blank', 'image' (photo or plate without text to OCR) or 'text'
         """
-        # Convert to grayscale
         if image.mode != 'L':
             image = image.convert('L')
+        return _page_content_type(np.asarray(image))
+    
+    def _page_cache_key(self, image, dpi: Optional[int] = None) -> str:
+        """
+        Cache key for a rendered page: hash of the bitmap plus every OCR setting
+        that changes Tesseract's output
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode('ascii'))
+        digest.update(image.tobytes())
         
-        # Could add more preprocessing here:
-        # - Noise reduction
-        # - Contrast enhancement
-        # - Binarization
+        settings = json.dumps({
+            'language': self.language,
+            'dpi': dpi or self.dpi,
+            'psm': self.psm,
+            'preprocessing': [PREPROCESSING_VERSION, list(self.preprocessing),
+                              self.binarization, self.target_x_height]
+        }, sort_keys=True)
+        digest.update(settings.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _extract_text_from_image(self, image) -> str:
+        """
+        Extract text from a single image using Tesseract
         
-        return image
+        Args:
+            image: PIL Image object
+            
+        Returns:
+            Extracted text
+        """
+        return self._ocr_image(image)['text']
     
-    def _get_ocr_confidence(self, image) -> float:
+    def _ocr_image(self, image, dpi: Optional[int] = None, text_layer: bool = False) -> Dict:
         """
-        Get OCR confidence score for an image
+        Run a single Tesseract pass that yields text, confidence and word boxes
         
         Args:
             image: PIL Image object
+            dpi: Resolution the image was rendered at (needed for text_layer)
+            text_layer: Also produce a text-only PDF page from the same pass
             
         Returns:
-            Average confidence score (0-100)
+            Dictionary with 'text', 'confidence' (0-100), 'words' (in the
+            coordinates of the input image; after deskew, the axis-aligned
+            bounding box of each rotated word), 'timings' in seconds per step and,
+            when the page was rotated, 'deskew_angle'. With text_layer it also
+            holds 'text_layer' (PDF bytes) and 'layer_transform'.
         """
-        try:
+        timings = {}
+        # Preprocess image for better OCR
+        processed_image, transform = self._preprocess_image(image, timings)
+        
+        start = time.perf_counter()
+        data = None
+        layer_pdf = None
+        if text_layer:
+            # The PDF renderer needs the tesseract CLI; its resolution fixes the page size
+            layer_dpi = max(1, round((dpi or self.dpi) * transform['scale']))
+            data, layer_pdf = self._tesseract_text_layer(processed_image, layer_dpi)
+            transform['layer_dpi'] = layer_dpi
+        elif self.engine == 'tesserocr':
+            try:
+                data = self._tesserocr_data(processed_image)
+            except RuntimeError as e:
+                # Raised when the API cannot be initialized (e.g. missing language data)
+                print(f"Note: tesserocr unavailable ({e}), falling back to pytesseract")
+                self.engine = 'pytesseract'
+        
+        if data is None:
             data = pytesseract.image_to_data(
-                image,
+                processed_image,
                 lang=self.language,
+                config=f'--psm {self.psm}',  # Automatic page segmentation
                 output_type=pytesseract.Output.DICT
             )
+        timings['tesseract'] = time.perf_counter() - start
+        
+        result = self._parse_tesseract_data(data)
+        
+        # Map word boxes from the cropped/deskewed/scaled image back to the input
+        # image; boxes of rotated words become their axis-aligned bounding boxes
+        offset_x, offset_y = transform['offset']
+        scale = transform['scale']
+        angle = transform['angle']
+        if (offset_x, offset_y, scale, angle) != (0, 0, 1.0, 0.0):
+            for word in result['words']:
+                left, top = word['left'] / scale, word['top'] / scale
+                right, bottom = left + word['width'] / scale, top + word['height'] / scale
+                if angle:
+                    left, top, right, bottom = _unrotate_box((left, top, right, bottom), angle,
+                                                             transform['rotated_size'],
+                                                             transform['crop_size'])
+                word['left'] = int(left) + offset_x
+                word['top'] = int(top) + offset_y
+                word['width'] = int(right - left)
+                word['height'] = int(bottom - top)
+        if angle:
+            result['deskew_angle'] = angle
+        result['timings'] = {step: round(seconds, 4) for step, seconds in timings.items()}
+        if text_layer:
+            result['text_layer'] = layer_pdf
+            result['layer_transform'] = transform
+        
+        return result
+    
+    def _tesseract_text_layer(self, image, dpi: int) -> Tuple[Dict, bytes]:
+        """
+        Run tesseract once to get word data and an invisible-text PDF page
+        
+        Returns:
+            (word data in image_to_data's DICT layout, text-only PDF bytes)
+        """
+        with tempfile.TemporaryDirectory(dir=self.scratch_dir) as tmp_dir:
+            input_path = os.path.join(tmp_dir, 'page.png')
+            output_base = os.path.join(tmp_dir, 'page')
+            image.save(input_path)
+            pytesseract.pytesseract.run_tesseract(
+                input_path, output_base, 'pdf', self.language,
+                config=f'--psm {self.psm} --dpi {dpi} -c textonly_pdf=1 -c tessedit_create_tsv=1'
+            )
+            with open(f'{output_base}.pdf', 'rb') as f:
+                layer_pdf = f.read()
+            with open(f'{output_base}.tsv', 'r', encoding='utf-8') as f:
+                data = _parse_tsv(f.read())
+        
+        return data, layer_pdf
+    
+    def _tesserocr_data(self, image) -> Dict:
+        """
+        Run Tesseract in-process and return word data in image_to_data's DICT layout
+        """
+        api = _get_tesserocr_api(self.language, self.psm)
+        data = {key: [] for key in ('text', 'conf', 'block_num', 'par_num', 'line_num',
+                                    'left', 'top', 'width', 'height')}
+        try:
+            api.SetImage(image)
+            api.Recognize()
+            iterator = api.GetIterator()
+            block_num = par_num = line_num = 0
+            level = tesserocr.RIL.WORD
             
-            # Calculate average confidence
-            confidences = [int(conf) for conf in data['conf'] if conf != '-1']
+            for word in tesserocr.iterate_level(iterator, level):
+                # Beginning of a block is also the beginning of its paragraph and line
+                if word.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                    block_num += 1
+                    par_num = 0
+                if word.IsAtBeginningOf(tesserocr.RIL.PARA):
+                    par_num += 1
+                    line_num = 0
+                if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    line_num += 1
+                
+                text = word.GetUTF8Text(level)
+                bbox = word.BoundingBox(level)
+                if not text or bbox is None:
+                    continue
+                left, top, right, bottom = bbox
+                data['text'].append(text)
+                data['conf'].append(word.Confidence(level))
+                data['block_num'].append(block_num)
+                data['par_num'].append(par_num)
+                data['line_num'].append(line_num)
+                data['left'].append(left)
+                data['top'].append(top)
+                data['width'].append(right - left)
+                data['height'].append(bottom - top)
+        finally:
+            api.Clear()
+        
+        return data
+    
+    def _parse_tesseract_data(self, data: Dict) -> Dict:
+        """
+        Rebuild page text and word-level confidences from image_to_data output
+        
+        Words are joined with spaces, lines with newlines and paragraphs with a
+        blank line, matching the layout of image_to_string.
+        """
+        text_parts = []
+        words = []
+        confidences = []
+        last_line = None
+        
+        for i, word in enumerate(data['text']):
+            word = (word or '').strip()
+            if not word:
+                continue
             
-            if confidences:
-                return sum(confidences) / len(confidences)
+            conf = float(data['conf'][i])
+            if conf >= 0:
+                confidences.append(conf)
             
-        except Exception:
-            pass
+            line_key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            if last_line is not None:
+                if line_key == last_line:
+                    text_parts.append(' ')
+                elif line_key[:2] == last_line[:2]:
+                    text_parts.append('\n')
+                else:
+                    text_parts.append('\n\n')
+            text_parts.append(word)
+            last_line = line_key
+            
+            words.append({
+                'text': word,
+                'conf': conf,
+                'left': data['left'][i],
+                'top': data['top'][i],
+                'width': data['width'][i],
+                'height': data['height'][i]
+            })
         
-        return 0.0
+        return {
+            'text': ''.join(text_parts),
+            'confidence': sum(confidences) / len(confidences) if confidences else 0.0,
+            'words': words
+        }
+    
+    def _preprocess_image(self, image, timings: Optional[Dict] = None) -> Tuple['Image', Dict]:
+        """
+        Preprocess image to improve OCR quality and speed
+        
+        Runs the configured PREPROCESSING_STEPS on a NumPy array: dark border and
+        margin removal, deskew, downscaling to the target x-height and binarization.
+        Smaller, binarized images also make Tesseract's layout analysis faster.
+        
+        Args:
+            image: Input image
+            timings: Dictionary that receives seconds spent per step
+            
+        Returns:
+            Tuple of (preprocessed image, transform) where transform records how to
+            map the result back to the input: 'offset' (crop origin), 'scale',
+            'angle' (deskew rotation) and the 'size', 'crop_size' and 'rotated_size'
+            of the intermediate images
+        """
+        timings = timings if timings is not None else {}
+        transform = {'offset': (0, 0), 'scale': 1.0, 'angle': 0.0, 'size': image.size,
+                     'crop_size': image.size, 'rotated_size': image.size}
+        
+        # Convert to grayscale
+        start = time.perf_counter()
+        if image.mode != 'L':
+            image = image.convert('L')
+        timings['grayscale'] = time.perf_counter() - start
+        
+        if not self.preprocessing:
+            return image, transform
+        
+        gray = np.asarray(image)
+        
+        def ink_mask(pixels):
+            return pixels < _otsu_threshold(pixels)
+        
+        for step in PREPROCESSING_STEPS:
+            if step not in self.preprocessing:
+                continue
+            start = time.perf_counter()
+            
+            if step == 'remove_border':
+                box = _content_box(ink_mask(gray))
+                if box is not None:
+                    top, bottom, left, right = box
+                    gray = gray[top:bottom, left:right]
+                    transform['offset'] = (left, top)
+                    transform['crop_size'] = transform['rotated_size'] = (right - left, bottom - top)
+            
+            elif step == 'deskew':
+                angle = round(_estimate_skew(ink_mask(gray)), 2)
+                if abs(angle) >= SKEW_STEP:
+                    rotated = Image.fromarray(gray).rotate(-angle, resample=Image.BILINEAR,
+                                                           expand=True, fillcolor=255)
+                    gray = np.asarray(rotated)
+                    transform['angle'] = angle
+                    transform['rotated_size'] = rotated.size
+            
+            elif step == 'downscale':
+                x_height = _estimate_x_height(ink_mask(gray))
+                # Only shrink; upscaling small text does not make Tesseract faster
+                if x_height and x_height > self.target_x_height * 1.25:
+                    scale = self.target_x_height / x_height
+                    size = (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale)))
+                    transform['scale'] = scale
+                    gray = np.asarray(Image.fromarray(gray).resize(size, Image.LANCZOS))
+            
+            elif step == 'binarize':
+                if self.binarization == 'sauvola':
+                    gray = _sauvola_binarize(gray)
+                else:
+                    gray = np.where(gray >= _otsu_threshold(gray), 255, 0).astype(np.uint8)
+            
+            timings[step] = time.perf_counter() - start
+        
+        return Image.fromarray(gray), transform
+    
+    def iter_text_from_images(self, source) -> Iterator[Dict]:
+        """
+        OCR a batch of page images, yielding page records as they finish
+        
+        Frames are decoded one at a time (in each worker when workers > 1), so
+        large folders and multipage TIFFs never have to be held in memory or
+        wrapped into a PDF first.
+        
+        Args:
+            source: Directory of images, glob pattern (e.g. 'scans/*.jpg'), single
+                image or multipage TIFF, or an explicit list of paths
+            
+        Yields:
+            Page dictionaries as from ocr_page_image(), numbered from 1 in
+            natural-sort order (page2 before page10), plus 'source' (file path)
+            and 'frame' (index within a multipage file)
+        """
+        frames = self._iter_image_frames(source)
+        tasks = ((path, frame, page_number)
+                 for page_number, (path, frame) in enumerate(frames, start=1))
+        
+        if self.workers > 1:
+            yield from self._iter_in_pool(_ocr_image_frame, tasks)
+            return
+        
+        for path, frame, page_number in tasks:
+            yield self._ocr_image_frame(path, frame, page_number)
+    
+    def extract_text_from_images(self, source) -> List[Dict]:
+        """
+        OCR a batch of page images (see iter_text_from_images)
+        
+        Returns:
+            List of page dictionaries in page order
+        """
+        return list(self.iter_text_from_images(source))
+    
+    def _iter_image_frames(self, source) -> Iterator[Tuple[str, int]]:
+        """Expand a batch source into (path, frame index) pairs in page order"""
+        if isinstance(source, (list, tuple)):
+            paths = list(source)
+        elif os.path.isdir(source):
+            paths = sorted((os.path.join(source, name) for name in os.listdir(source)
+                            if name.lower().endswith(IMAGE_EXTENSIONS)), key=_natural_sort_key)
+        elif os.path.isfile(source):
+            paths = [source]
+        else:
+            paths = sorted((path for path in glob.glob(source) if os.path.isfile(path)),
+                           key=_natural_sort_key)
+        
+        for path in paths:
+            # Opening only reads headers; n_frames walks the TIFF directory, not the pixels
+            with Image.open(path) as image:
+                frame_count = getattr(image, 'n_frames', 1)
+            for frame in range(frame_count):
+                yield path, frame
+    
+    def _ocr_image_frame(self, path: str, frame: int, page_number: int) -> Dict:
+        """Decode one image frame and OCR it"""
+        with Image.open(path) as image:
+            if frame:
+                image.seek(frame)
+            dpi = image.info.get('dpi')
+            page_data = self.ocr_page_image(image, page_number,
+                                            dpi=int(round(dpi[0])) if dpi else None)
+        
+        page_data['source'] = path
+        page_data['frame'] = frame
+        return page_data
     
     def extract_text_from_image_file(self, image_path: str) -> str:
         """
@@ -167,37 +1363,46 @@ class OCRProcessor:
         image = Image.open(image_path)
         return self._extract_text_from_image(image)
     
-    def is_scanned_pdf(self, pdf_path: str, sample_pages: int = 3) -> bool:
+    def is_scanned_pdf(self, pdf_path: str, sample_pages: Optional[int] = None) -> bool:
         """
         Determine if a PDF is scanned (image-based) or native (text-based)
         
+        Every page is classified from its embedded characters and image coverage
+        (see text_layer_map), so scanned covers do not decide for the whole book.
+        
         Args:
             pdf_path: Path to PDF file
-            sample_pages: Number of pages to sample
+            sample_pages: Only look at the first pages (default: all pages)
             
         Returns:
-            True if PDF appears to be scanned
+            True if most non-blank pages are scanned
         """
         try:
-            import pdfplumber
-            
-            with pdfplumber.open(pdf_path) as pdf:
-                text_chars = 0
-                pages_checked = 0
-                
-                # Check first few pages
-                for page in pdf.pages[:sample_pages]:
-                    text = page.extract_text()
-                    if text:
-                        text_chars += len(text.strip())
-                    pages_checked += 1
-                
-                # If very little text found, likely scanned
-                avg_chars = text_chars / pages_checked if pages_checked > 0 else 0
-                return avg_chars < 50  # Threshold for scanned detection
-        
+            page_types = self.text_layer_map(pdf_path, sample_pages)
         except Exception:
             return False
+        
+        scanned = sum(1 for page_type in page_types.values() if page_type == 'scanned')
+        with_text = sum(1 for page_type in page_types.values() if page_type in ('text', 'mixed'))
+        return scanned > with_text
+    
+    def text_layer_map(self, pdf_path: str, max_pages: Optional[int] = None) -> Dict[int, str]:
+        """
+        Classify every page as 'text', 'mixed', 'scanned' or 'blank'
+        
+        Counts embedded characters and image coverage only (no layout analysis),
+        so it is cheap enough to route work page by page, e.g. OCR only the
+        'scanned' pages with iter_text_from_pdf(start_page=..., end_page=...).
+        
+        Args:
+            pdf_path: Path to PDF file
+            max_pages: Only classify the first pages (default: all)
+            
+        Returns:
+            Mapping of page number (1-indexed) to page type
+        """
+        from extraction_backends import text_layer_map
+        return text_layer_map(pdf_path, max_pages=max_pages)
     
     @staticmethod
     def get_supported_languages() -> List[str]:
@@ -236,3 +1441,77 @@ class OCRProcessor:
             self.dpi = dpi
         else:
             raise ValueError("DPI must be between 100 and 600")
+    
+    def set_adaptive_dpi(self, enabled: bool = True, low_dpi: int = DEFAULT_LOW_DPI,
+                         confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD):
+        """
+        Configure adaptive-DPI OCR
+        
+        Args:
+            enabled: OCR at low_dpi first and re-run low-confidence pages at full DPI
+            low_dpi: First-pass DPI (100-600)
+            confidence_threshold: Page confidence (0-100) that triggers a re-run
+        """
+        if not 100 <= low_dpi <= 600:
+            raise ValueError("DPI must be between 100 and 600")
+        self.adaptive_dpi = enabled
+        self.low_dpi = low_dpi
+        self.confidence_threshold = confidence_threshold
+    
+    def set_preprocessing(self, steps: Sequence[str] = DEFAULT_PREPROCESSING,
+                          binarization: str = 'otsu',
+                          target_x_height: int = DEFAULT_TARGET_X_HEIGHT):
+        """
+        Configure the image preprocessing pipeline
+        
+        Args:
+            steps: Any of PREPROCESSING_STEPS (empty = grayscale conversion only)
+            binarization: 'otsu' or 'sauvola'
+            target_x_height: x-height in pixels for the 'downscale' step
+        """
+        unknown = set(steps) - set(PREPROCESSING_STEPS)
+        if unknown:
+            raise ValueError(f"Unknown preprocessing steps: {', '.join(sorted(unknown))}")
+        if binarization not in ('otsu', 'sauvola'):
+            raise ValueError("binarization must be 'otsu' or 'sauvola'")
+        if steps and not NUMPY_AVAILABLE:
+            print("Note: numpy not installed, preprocessing limited to grayscale conversion")
+            steps = ()
+        
+        self.preprocessing = tuple(step for step in PREPROCESSING_STEPS if step in steps)
+        self.binarization = binarization
+        self.target_x_height = target_x_height
+    
+    def set_engine(self, engine: str):
+        """
+        Set OCR engine
+        
+        Args:
+            engine: 'tesserocr', 'pytesseract' or 'auto'
+        """
+        self.engine = self._resolve_engine(engine)
+    
+    @staticmethod
+    def _resolve_engine(engine: str) -> str:
+        """Map 'auto' to the fastest installed engine"""
+        if engine == 'auto':
+            return 'tesserocr' if TESSEROCR_AVAILABLE else 'pytesseract'
+        if engine not in ('tesserocr', 'pytesseract'):
+            raise ValueError("engine must be 'tesserocr', 'pytesseract' or 'auto'")
+        if engine == 'tesserocr' and not TESSEROCR_AVAILABLE:
+            print("Note: tesserocr not installed, using pytesseract")
+            return 'pytesseract'
+        return engine
+    
+    def set_workers(self, workers: int, max_in_flight: Optional[int] = None):
+        """
+        Set number of OCR worker processes
+        
+        Args:
+            workers: Worker processes (1 = serial)
+            max_in_flight: Maximum pages queued at once (default: 2 per worker)
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.max_in_flight = max_in_flight or workers * 2
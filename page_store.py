@@ -0,0 +1,168 @@
+"""
+Compact Page Storage Module
+Slotted page records that store cleaned text as spans into the raw text
+"""
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Keys stored in dedicated slots; anything else goes to the extras dict
+_CORE_KEYS = ('page_number', 'text', 'cleaned_text')
+
+
+class PageRecord(MutableMapping):
+    """
+    Memory-efficient replacement for the per-page dict
+    
+    Behaves like the dict it replaces ({'page_number', 'text', 'cleaned_text', ...}),
+    so existing consumers such as AITextAnalyzer keep working. The cleaned text is
+    not stored as a second copy: it is kept as (start, end) character spans into
+    the raw text and rebuilt on access.
+    """
+    
+    __slots__ = ('page_number', 'text', '_spans', '_cleaned', '_extras')
+    
+    def __init__(self, page_number: int, text: str,
+                 clean_spans: Optional[Iterable[Tuple[int, int]]] = None,
+                 cleaned_text: Optional[str] = None,
+                 extras: Optional[Dict] = None):
+        """
+        Initialize page record
+        
+        Args:
+            page_number: 1-indexed page number
+            text: Raw page text
+            clean_spans: Character spans of text kept by cleaning, joined with newlines
+            cleaned_text: Explicit cleaned text, used only when spans are not given
+            extras: Additional page fields (layout data, OCR confidence, ...)
+        """
+        self.page_number = page_number
+        self.text = text
+        self._spans = None
+        self._cleaned = None
+        self._extras = None
+        
+        if clean_spans is not None:
+            self._spans = array('I', [offset for span in clean_spans for offset in span])
+        else:
+            self._cleaned = cleaned_text if cleaned_text is not None else text
+        
+        for key, value in (extras or {}).items():
+            self[key] = value
+    
+    @property
+    def cleaned_text(self) -> str:
+        if self._spans is None:
+            return self._cleaned
+        spans = self._spans
+        text = self.text
+        return '\n'.join(text[spans[i]:spans[i + 1]] for i in range(0, len(spans), 2))
+    
+    def __getitem__(self, key):
+        if key == 'page_number':
+            return self.page_number
+        if key == 'text':
+            return self.text
+        if key == 'cleaned_text':
+            return self.cleaned_text
+        if self._extras is not None and key in self._extras:
+            value = self._extras[key]
+            if key == 'layout_elements':
+                return _expand_layout(value)
+            return value
+        raise KeyError(key)
+    
+    def __setitem__(self, key, value):
+        if key == 'page_number':
+            self.page_number = value
+        elif key == 'text':
+            # Spans refer to the old text; keep the current cleaned text explicitly
+            self._cleaned = self.cleaned_text
+            self._spans = None
+            self.text = value
+        elif key == 'cleaned_text':
+            self._cleaned = value
+            self._spans = None
+        else:
+            if self._extras is None:
+                self._extras = {}
+            if key == 'layout_elements':
+                value = _compact_layout(value)
+            self._extras[key] = value
+    
+    def __delitem__(self, key):
+        if key in _CORE_KEYS or self._extras is None:
+            raise KeyError(key)
+        del self._extras[key]
+        if not self._extras:
+            self._extras = None
+    
+    def __iter__(self) -> Iterator[str]:
+        yield from _CORE_KEYS
+        if self._extras is not None:
+            yield from self._extras
+    
+    def __len__(self) -> int:
+        return len(_CORE_KEYS) + (len(self._extras) if self._extras is not None else 0)
+    
+    def __contains__(self, key) -> bool:
+        return key in _CORE_KEYS or (self._extras is not None and key in self._extras)
+    
+    def __repr__(self) -> str:
+        return f"PageRecord(page_number={self.page_number}, chars={len(self.text)})"
+    
+    def to_dict(self, include_spans: bool = False) -> Dict:
+        """
+        Convert to a plain JSON-serializable dict
+        
+        Args:
+            include_spans: Store cleaning spans instead of the cleaned text copy
+        """
+        data = {'page_number': self.page_number, 'text': self.text}
+        if include_spans and self._spans is not None:
+            data['cleaned_spans'] = list(self._spans)
+        else:
+            data['cleaned_text'] = self.cleaned_text
+        for key in (self._extras or {}):
+            data[key] = self[key]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PageRecord':
+        """Build a record from a page dict (as produced by to_dict() or the extractors)"""
+        extras = {k: v for k, v in data.items()
+                  if k not in _CORE_KEYS and k != 'cleaned_spans'}
+        flat_spans = data.get('cleaned_spans')
+        spans = None
+        if flat_spans is not None:
+            spans = zip(flat_spans[0::2], flat_spans[1::2])
+        return cls(data['page_number'], data['text'], clean_spans=spans,
+                   cleaned_text=data.get('cleaned_text'), extras=extras)
+
+
+def _compact_layout(elements: List[Dict]) -> Tuple:
+    """Store layout elements as tuples instead of dicts with nested bbox dicts"""
+    compact = []
+    for element in elements:
+        bbox = element.get('bbox')
+        if bbox is not None:
+            bbox = (bbox['x'], bbox['y'], bbox['width'], bbox['height'])
+        compact.append((element.get('type', 'text'), element.get('text', ''),
+                        bbox, element.get('reading_order', 0)))
+    return tuple(compact)
+
+
+def _expand_layout(compact: Tuple) -> List[Dict]:
+    """Rebuild the layout element dicts produced by DeepDocProcessor"""
+    elements = []
+    for element_type, text, bbox, reading_order in compact:
+        if bbox is not None:
+            bbox = {'x': bbox[0], 'y': bbox[1], 'width': bbox[2], 'height': bbox[3]}
+        elements.append({
+            'type': element_type,
+            'text': text,
+            'bbox': bbox,
+            'reading_order': reading_order
+        })
+    return elements
@@ -2,9 +2,19 @@
 Enhanced PDF Processor Module
 Handles PDF text extraction with AI-powered content filtering and organization
 """
+import os
 import re
+from bisect import bisect_left
+from statistics import median
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 import pdfplumber
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
+
+from extraction_backends import (ExtractionBackend, classify_page, get_backend, iter_heading_text,
+                                 select_backend, text_layer_map)
+from extraction_cache import ExtractionCache
+from page_store import PageRecord
 
 # Check AI availability at module level
 try:
@@ -19,27 +29,225 @@ try:
 except ImportError:
     DEEPDOC_AVAILABLE = False
 
+# Check OCR availability (used for pages without a text layer)
+try:
+    from ocr_processor import OCRProcessor, OCR_AVAILABLE
+except ImportError:
+    OCR_AVAILABLE = False
+
+# Bump whenever _clean_text() output changes so cached extractions are invalidated
+CLEANING_RULES_VERSION = 1
+
+# Page-range chunking limits for parallel extraction
+MIN_CHUNK_PAGES = 4
+MAX_CHUNK_PAGES = 64
+
+# Basic chapter heading patterns (used when AI analysis is disabled)
+CHAPTER_PATTERNS = [
+    r'^(Chapter|CHAPTER|Capítulo|CAPÍTULO)\s+(\d+|[IVXLCDM]+)',
+    r'^(\d+)\.\s+[A-Z]',
+    r'^[A-Z][A-Z\s]{10,}$'  # ALL CAPS headings
+]
+
+# Portion of the page height scanned for headings in lazy mode
+HEADING_SCAN_FRACTION = 0.3
+HEADING_SCAN_LINES = 5
+
+# Pages with fewer text-layer characters than this (and an image) are sent to OCR
+OCR_MIN_CHARS = 20
+
+# Header/footer band learning for margin cropping
+MARGIN_SAMPLE_PAGES = 15
+MARGIN_ZONE = 0.12        # headers/footers must lie within this fraction of the page edge
+MARGIN_GAP_FACTOR = 1.5   # gap to the body must exceed typical line spacing by this factor
+MARGIN_MIN_SHARE = 0.5    # share of sampled pages that must show the band
+MARGIN_PADDING = 0.005
+
+
+def _read_page(page, margin_bands: Optional[Tuple[float, float]] = None,
+               ocr_processor: Optional['OCRProcessor'] = None,
+               ocr_min_chars: int = OCR_MIN_CHARS) -> Tuple[Optional[str], Optional[Dict]]:
+    """
+    Extract page text, routing pages without a usable text layer to OCR
+    
+    The body region is used when margin bands are known. The page is classified
+    by its text-layer character count and image coverage, which needs no layout
+    analysis; only 'scanned' pages are rendered and OCR'd.
+    
+    Returns:
+        (text, extras) where extras records how the page was extracted; None for
+        plain text-layer pages, so most page records carry no extras dict
+    """
+    chars = page.chars
+    region = page
+    if margin_bands:
+        top, bottom = page.height * margin_bands[0], page.height * margin_bands[1]
+        # Filtering the characters is much cheaper than page.crop(), which clips
+        # every object on the page; the crop is only needed to render for OCR
+        chars = [char for char in chars if char['bottom'] > top and char['top'] < bottom]
+        region = page.crop((0, top, page.width, bottom))
+    
+    if ocr_processor is not None and classify_page(page, ocr_min_chars, chars) == 'scanned':
+        try:
+            ocr_data = ocr_processor.ocr_rendered_page(
+                lambda dpi: region.to_image(resolution=dpi).original, page.page_number
+            )
+            if ocr_data.get('ocr_skipped'):
+                # Blank or image-only page: the few text-layer characters are all there is
+                return pdfplumber.utils.extract_text(chars), {'ocr_skipped': ocr_data['ocr_skipped']}
+            extras = {k: v for k, v in ocr_data.items() if k not in ('page_number', 'text')}
+            extras['text_source'] = 'ocr'
+            return ocr_data['text'], extras
+        except Exception:
+            # Tesseract missing or failed on this page: keep whatever the text layer has
+            pass
+    
+    return pdfplumber.utils.extract_text(chars), None
+
+
+def _char_lines(chars: List[Dict], height: float, tolerance: float = 2.0) -> List[Tuple[float, float]]:
+    """Group characters into text lines; returns (top, bottom) as fractions of page height"""
+    lines = []
+    for char in sorted(chars, key=lambda c: c['top']):
+        if not char.get('text', '').strip():
+            continue
+        if lines and char['top'] - lines[-1][0] <= tolerance:
+            lines[-1][1] = max(lines[-1][1], char['bottom'])
+        else:
+            lines.append([char['top'], char['bottom']])
+    return [(top / height, bottom / height) for top, bottom in lines]
+
+
+def _extract_page_range(pdf_path: str, start_page: int, end_page: int,
+                        margin_bands: Optional[Tuple[float, float]] = None,
+                        ocr_processor: Optional['OCRProcessor'] = None,
+                        ocr_min_chars: int = OCR_MIN_CHARS) -> List[Tuple[int, str, Optional[Dict]]]:
+    """
+    Extract raw text for an inclusive 1-indexed page range
+    Runs in a worker process, which opens the PDF independently
+    """
+    results = []
+    with pdfplumber.open(pdf_path, pages=list(range(start_page, end_page + 1))) as pdf:
+        for page in pdf.pages:
+            text, extras = _read_page(page, margin_bands, ocr_processor, ocr_min_chars)
+            page.close()
+            if text:
+                results.append((page.page_number, text, extras))
+    return results
+
+
+class PageLRUCache:
+    """
+    Least-recently-used store for extracted pages
+    Bounded by page count and, optionally, by approximate text size in bytes
+    """
+    
+    def __init__(self, max_pages: int = 64, max_bytes: Optional[int] = None):
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._pages = OrderedDict()
+    
+    def get(self, page_number: int) -> Optional[Dict]:
+        page = self._pages.get(page_number)
+        if page is not None:
+            self._pages.move_to_end(page_number)
+        return page
+    
+    def put(self, page: Dict):
+        page_number = page['page_number']
+        if page_number in self._pages:
+            self.total_bytes -= self._page_size(self._pages.pop(page_number))
+        
+        self._pages[page_number] = page
+        self.total_bytes += self._page_size(page)
+        
+        # Always keep the newest page, even if it alone exceeds the byte budget
+        while len(self._pages) > 1 and (
+            len(self._pages) > self.max_pages or
+            (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            _, evicted = self._pages.popitem(last=False)
+            self.total_bytes -= self._page_size(evicted)
+    
+    def __contains__(self, page_number: int) -> bool:
+        return page_number in self._pages
+    
+    def __len__(self) -> int:
+        return len(self._pages)
+    
+    @staticmethod
+    def _page_size(page: Dict) -> int:
+        # Cleaned text is stored as spans into the raw text, so only the raw text counts
+        return len(page['text'])
+
 
 class PDFProcessor:
-    def __init__(self, pdf_path: str, use_ai: bool = True):
+    def __init__(self, pdf_path: str, use_ai: bool = True,
+                 workers: Optional[int] = 1, chunk_size: Optional[int] = None,
+                 cache: Optional[ExtractionCache] = None, lazy: bool = False,
+                 page_cache_pages: int = 64, page_cache_bytes: Optional[int] = None,
+                 crop_margins: bool = False, backend: Optional[str] = None,
+                 use_ocr: bool = True, ocr_min_chars: int = OCR_MIN_CHARS):
         """
         Initialize PDF processor with integrated advanced features
         
         Args:
             pdf_path: Path to PDF file
             use_ai: Enable AI-powered analysis (default: True)
+            workers: Processes for pdfplumber extraction (1 = serial, None = all cores)
+            chunk_size: Pages per worker task (default: chosen from document size)
+            cache: Optional on-disk cache for extraction and analysis results
+            lazy: Detect chapters cheaply and extract only requested chapters' pages
+            page_cache_pages: Maximum pages kept in memory in lazy mode
+            page_cache_bytes: Optional text size limit for pages kept in lazy mode
+            crop_margins: Learn header/footer bands from sample pages and extract only
+                the body region (pdfplumber path). An accuracy option: headers and
+                footers are removed geometrically, but every object on the page is
+                still parsed, so extraction is about as fast as without it
+            backend: Extraction backend name ('pdfplumber', 'pdfminer', 'pypdfium2',
+                'deepdoctection'), 'auto' for the fastest backend able to handle the
+                document, or None for deepdoctection when installed, else pdfplumber
+            use_ocr: OCR pages that have no usable text layer (pdfplumber path; with
+                'auto', documents containing scanned pages are kept on pdfplumber)
+            ocr_min_chars: Text-layer characters below which an image page is OCR'd
         """
         self.pdf_path = pdf_path
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
         self.pages = []
         self.chapters = []
         self.use_ai = use_ai and AI_AVAILABLE
         self.ai_analyzer = AITextAnalyzer() if self.use_ai else None
         self.structured_content = None
         self.document_structure = None
+        self.cache = cache
+        self._cache_key = None
+        self._chapters_detected = False
+        self._lazy_chapters = None
+        self.lazy = lazy
+        self.page_cache = PageLRUCache(page_cache_pages, page_cache_bytes) if lazy else None
+        self.total_pages = None
+        self._page_index = None
+        self.crop_margins = crop_margins
+        self.margin_bands = None
+        self._margins_learned = False
+        self.backend_name = backend
+        self.extraction_method = None
+        self.ocr_min_chars = ocr_min_chars
+        self._page_types = None
+        
+        # OCR is only applied to pages without a usable text layer
+        self.ocr_processor = None
+        if use_ocr and OCR_AVAILABLE:
+            try:
+                self.ocr_processor = OCRProcessor()
+            except Exception as e:
+                print(f"Note: OCR unavailable, image-only pages will be skipped: {e}")
         
         # Try to use deepdoctection if available, otherwise use pdfplumber
         self.deepdoc_processor = None
-        if DEEPDOC_AVAILABLE:
+        if DEEPDOC_AVAILABLE and backend in (None, 'deepdoctection'):
             try:
                 self.deepdoc_processor = DeepDocProcessor()
             except Exception as e:
@@ -50,87 +258,295 @@ class PDFProcessor:
         """
         Extract text from PDF pages using best available method
         Automatically uses deepdoctection if available, otherwise pdfplumber
+        Served from the extraction cache when this PDF was processed before
+        """
+        if self._load_from_cache():
+            return self.pages
+        
+        self.pages = list(self.iter_pages())
+        self._save_to_cache()
+        return self.pages
+    
+    def iter_pages(self) -> Iterator[Dict]:
         """
-        # Try deepdoctection first for better layout analysis
-        if self.deepdoc_processor:
-            return self._extract_with_deepdoctection()
+        Yield cleaned pages one at a time using best available method
         
-        # Fall back to standard extraction
-        return self._extract_with_pdfplumber()
+        Unlike extract_text(), pages are not kept on the processor, so peak
+        memory stays flat regardless of document length. The stream can be
+        passed to detect_chapters(), get_text_for_reading() and export_to_json().
+        """
+        yield from self._get_backend().iter_pages(self)
     
-    def _extract_with_deepdoctection(self) -> List[Dict]:
+    def _get_backend(self) -> ExtractionBackend:
+        """Resolve the configured backend once and record it as the extraction method"""
+        if self.extraction_method is None:
+            if self.backend_name == 'auto':
+                backend = select_backend(self)
+            elif self.backend_name:
+                backend = get_backend(self.backend_name)
+                if not backend.is_available(self):
+                    print(f"Note: {backend.name} backend unavailable, using pdfplumber")
+                    backend = get_backend('pdfplumber')
+            elif self.deepdoc_processor:
+                # Try deepdoctection first for better layout analysis
+                backend = get_backend('deepdoctection')
+            else:
+                # Fall back to standard extraction
+                backend = get_backend('pdfplumber')
+            self.extraction_method = backend.name
+        
+        return get_backend(self.extraction_method)
+    
+    def _get_page_types(self) -> Dict[int, str]:
+        """
+        Per-page 'text'/'mixed'/'scanned'/'blank' classification, computed once
+        Counts glyphs and image area over every page; no text is extracted
+        """
+        if self._page_types is None:
+            try:
+                self._page_types = text_layer_map(self.pdf_path, self.ocr_min_chars)
+            except Exception as e:
+                print(f"Note: could not classify pages: {e}")
+                self._page_types = {}
+        return self._page_types
+    
+    def _extract_with_deepdoctection(self) -> Iterator[Dict]:
         """Extract text using deepdoctection for advanced layout analysis"""
+        last_page = 0
         try:
-            pages_data = self.deepdoc_processor.extract_text_with_layout(self.pdf_path)
-            
-            # Convert to standard format and add cleaned text
-            for page_data in pages_data:
-                page_data['cleaned_text'] = self._clean_text(page_data['text'], page_data['page_number'])
-            
-            self.pages = pages_data
-            return pages_data
+            # PDFProcessor keeps (or streams) the pages itself, so the analysis is not retained
+            for page_data in self.deepdoc_processor.iter_text_with_layout(self.pdf_path, retain=False):
+                # Convert to standard format and add cleaned text
+                page_number = page_data.pop('page_number')
+                text = page_data.pop('text')
+                last_page = page_number
+                yield self._make_page(page_number, text, extras=page_data)
         
         except Exception as e:
             print(f"Note: deepdoctection extraction failed, using standard method: {e}")
-            return self._extract_with_pdfplumber()
+            if last_page == 0:
+                self.extraction_method = 'pdfplumber'
+            # Resume after the pages already delivered to the consumer
+            yield from self._extract_with_pdfplumber_auto(start_page=last_page + 1)
     
-    def _extract_with_pdfplumber(self) -> List[Dict]:
+    def _extract_with_pdfplumber_auto(self, start_page: int = 1) -> Iterator[Dict]:
+        """Use parallel pdfplumber extraction when more than one worker is configured"""
+        if self.workers > 1:
+            return self._extract_with_pdfplumber_parallel(start_page)
+        return self._extract_with_pdfplumber(start_page)
+    
+    def _extract_with_pdfplumber(self, start_page: int = 1) -> Iterator[Dict]:
         """Standard extraction using pdfplumber"""
-        pages_data = []
-        
         with pdfplumber.open(self.pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages):
-                text = page.extract_text()
+            # Sampled pages stay parsed, so the loop below reuses (and then closes) them
+            margin_bands = self._get_margin_bands(pdf, release_pages=False)
+            for i in range(start_page - 1, len(pdf.pages)):
+                page = pdf.pages[i]
+                text, extras = _read_page(page, margin_bands, self.ocr_processor, self.ocr_min_chars)
+                # Release cached chars/objects so memory does not grow with the book
+                page.close()
                 if text:
-                    pages_data.append({
-                        'page_number': i + 1,
-                        'text': text,
-                        'cleaned_text': self._clean_text(text, i + 1)
-                    })
+                    yield self._make_page(i + 1, text, extras)
+    
+    def _extract_pdfplumber_pages(self, page_numbers: Iterable[int]) -> Iterator[Dict]:
+        """pdfplumber extraction of selected pages only (lazy mode)"""
+        margin_bands = self._get_margin_bands()
+        with pdfplumber.open(self.pdf_path, pages=sorted(set(page_numbers))) as pdf:
+            for page in pdf.pages:
+                text, extras = _read_page(page, margin_bands, self.ocr_processor, self.ocr_min_chars)
+                page.close()
+                if text:
+                    yield self._make_page(page.page_number, text, extras)
+    
+    def _extract_with_pdfplumber_parallel(self, start_page: int = 1) -> Iterator[Dict]:
+        """
+        Parallel pdfplumber extraction over page ranges
+        Each worker process opens the PDF on its own; results are merged in page order
+        """
+        with pdfplumber.open(self.pdf_path) as pdf:
+            total_pages = len(pdf.pages)
+            margin_bands = self._get_margin_bands(pdf)
+        
+        chunk_size = self.chunk_size or self._choose_chunk_size(total_pages - start_page + 1)
+        ranges = [
+            (first, min(first + chunk_size - 1, total_pages))
+            for first in range(start_page, total_pages + 1, chunk_size)
+        ]
+        
+        # Not worth spawning processes for a single chunk
+        if len(ranges) <= 1:
+            yield from self._extract_with_pdfplumber(start_page)
+            return
+        
+        workers = min(self.workers, len(ranges))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of ranges in flight so memory stays flat
+            pending = deque()
+            next_range = 0
+            while next_range < len(ranges) or pending:
+                while next_range < len(ranges) and len(pending) < workers * 2:
+                    first, last = ranges[next_range]
+                    pending.append(executor.submit(
+                        _extract_page_range, self.pdf_path, first, last,
+                        margin_bands, self.ocr_processor, self.ocr_min_chars
+                    ))
+                    next_range += 1
+                
+                for page_number, text, extras in pending.popleft().result():
+                    yield self._make_page(page_number, text, extras)
+    
+    def _get_margin_bands(self, pdf=None, release_pages: bool = True) -> Optional[Tuple[float, float]]:
+        """
+        Header/footer bands for margin cropping, learned once per document
+        
+        With release_pages=False the sampled pages of pdf keep their parsed
+        objects, for callers that extract those pages next.
+        """
+        if not self.crop_margins:
+            return None
+        
+        if not self._margins_learned:
+            if pdf is None:
+                with pdfplumber.open(self.pdf_path) as own_pdf:
+                    self.margin_bands = self._learn_margin_bands(own_pdf)
+            else:
+                self.margin_bands = self._learn_margin_bands(pdf, release_pages)
+            self._margins_learned = True
         
-        self.pages = pages_data
-        return pages_data
+        return self.margin_bands
+    
+    def _learn_margin_bands(self, pdf, release_pages: bool = True) -> Optional[Tuple[float, float]]:
+        """
+        Learn the body region from character y-positions on sample pages
+        
+        A header is the first line of a page when it sits near the top edge and is
+        separated from the body by a wider than usual gap; footers likewise at the
+        bottom. If enough sampled pages agree, the band is cut away.
+        
+        Returns:
+            (top, bottom) of the body region as fractions of page height, or None
+        """
+        total_pages = len(pdf.pages)
+        step = max(1, total_pages // MARGIN_SAMPLE_PAGES)
+        sample = pdf.pages[::step][:MARGIN_SAMPLE_PAGES]
+        
+        header_bottoms = []
+        footer_tops = []
+        for page in sample:
+            lines = _char_lines(page.chars, page.height)
+            if release_pages:
+                page.close()
+            if len(lines) < 3:
+                continue
+            
+            typical_gap = median(lines[i + 1][0] - lines[i][1] for i in range(len(lines) - 1))
+            min_gap = max(typical_gap, 0) * MARGIN_GAP_FACTOR
+            
+            first, second = lines[0], lines[1]
+            if first[1] <= MARGIN_ZONE and second[0] - first[1] > min_gap:
+                header_bottoms.append(first[1])
+            
+            last, before_last = lines[-1], lines[-2]
+            if last[0] >= 1 - MARGIN_ZONE and last[0] - before_last[1] > min_gap:
+                footer_tops.append(last[0])
+        
+        required = max(2, len(sample) * MARGIN_MIN_SHARE)
+        top = median(header_bottoms) + MARGIN_PADDING if len(header_bottoms) >= required else None
+        bottom = median(footer_tops) - MARGIN_PADDING if len(footer_tops) >= required else None
+        
+        if top is None and bottom is None:
+            return None
+        return (top or 0.0, bottom or 1.0)
+    
+    def _choose_chunk_size(self, page_count: int) -> int:
+        """
+        Pick pages per task: about four tasks per worker for load balancing,
+        clamped so small PDFs still spread out and huge ones keep tasks short
+        """
+        target = -(-page_count // (self.workers * 4))
+        return max(MIN_CHUNK_PAGES, min(MAX_CHUNK_PAGES, target))
+    
+    def _make_page(self, page_number: int, text: str, extras: Optional[Dict] = None) -> PageRecord:
+        """Build a compact page record with cleaned text stored as spans into text"""
+        return PageRecord(page_number, text, clean_spans=self._clean_spans(text, page_number), extras=extras)
     
     def _clean_text(self, text: str, page_num: int) -> str:
         """Remove headers, footers, and page numbers from text"""
+        return '\n'.join(text[start:end] for start, end in self._clean_spans(text, page_num))
+    
+    def _clean_spans(self, text: str, page_num: int) -> List[Tuple[int, int]]:
+        """
+        Character spans of the lines _clean_text() keeps
+        Adjacent kept lines are merged, so joining the spans with newlines gives the cleaned text
+        """
         lines = text.split('\n')
-        cleaned_lines = []
+        spans = []
         
-        # Skip first and last 2 lines (likely headers/footers)
-        content_lines = lines[2:-2] if len(lines) > 4 else lines
+        # Skip first and last 2 lines (likely headers/footers), unless margin
+        # cropping already removed that band geometrically
+        content_range = range(len(lines))
+        if len(lines) > 4:
+            top, bottom = self.margin_bands or (0.0, 1.0)
+            skip_top = 0 if top > 0 else 2
+            skip_bottom = 0 if bottom < 1 else 2
+            content_range = range(skip_top, len(lines) - skip_bottom)
         
-        for line in content_lines:
+        offset = 0
+        line_starts = []
+        for line in lines:
+            line_starts.append(offset)
+            offset += len(line) + 1
+        
+        for i in content_range:
+            line = lines[i]
             # Skip lines that are just page numbers
             if re.match(r'^\s*\d+\s*$', line):
                 continue
             # Skip very short lines at edges (likely headers/footers)
             if len(line.strip()) < 3:
                 continue
-            cleaned_lines.append(line)
+            start = line_starts[i]
+            end = start + len(line)
+            if spans and spans[-1][1] + 1 == start:
+                spans[-1] = (spans[-1][0], end)
+            else:
+                spans.append((start, end))
         
-        return '\n'.join(cleaned_lines)
+        return spans
     
-    def detect_chapters(self) -> List[Dict]:
-        """Detect chapter headings in the document"""
+    def detect_chapters(self, pages: Optional[Iterable[Dict]] = None) -> List[Dict]:
+        """
+        Detect chapter headings in the document
+        
+        Args:
+            pages: Optional page stream (e.g. from iter_pages()); defaults to self.pages
+        """
+        if pages is None:
+            # Chapters restored from the extraction cache are already final
+            if self._chapters_detected:
+                return self.chapters
+            if self.lazy and not self.pages:
+                # The boundary scan reads every page, so it runs once per processor
+                if self._lazy_chapters is None:
+                    self._lazy_chapters = self._detect_chapters_lazily()
+                self.chapters = self._lazy_chapters
+                return self.chapters
+            pages = self.pages
+        
         if self.use_ai and self.ai_analyzer:
             # Use AI-powered chapter detection
-            chapters = self.ai_analyzer.detect_chapters_advanced(self.pages)
-            self.chapters = chapters
+            chapters = self.ai_analyzer.detect_chapters_advanced(pages)
+            self._set_chapters(chapters)
             return chapters
         
         # Fallback to basic pattern matching
         chapters = []
-        chapter_patterns = [
-            r'^(Chapter|CHAPTER|Capítulo|CAPÍTULO)\s+(\d+|[IVXLCDM]+)',
-            r'^(\d+)\.\s+[A-Z]',
-            r'^[A-Z][A-Z\s]{10,}$'  # ALL CAPS headings
-        ]
         
-        for page_data in self.pages:
+        for page_data in pages:
             lines = page_data['text'].split('\n')
             for i, line in enumerate(lines):
                 line = line.strip()
-                for pattern in chapter_patterns:
+                for pattern in CHAPTER_PATTERNS:
                     if re.match(pattern, line):
                         chapters.append({
                             'title': line,
@@ -139,30 +555,211 @@ class PDFProcessor:
                         })
                         break
         
-        self.chapters = chapters
+        self._set_chapters(chapters)
         return chapters
     
-    def get_text_for_reading(self) -> str:
-        """Get cleaned text suitable for reading"""
-        all_text = []
-        for page in self.pages:
-            all_text.append(page['cleaned_text'])
-        return '\n\n'.join(all_text)
+    def _set_chapters(self, chapters: List[Dict]):
+        """Store detected chapters and persist them alongside the cached pages"""
+        self.chapters = chapters
+        if self.pages:
+            self._chapters_detected = True
+            self._save_to_cache()
+    
+    def get_text_for_reading(self, pages: Optional[Iterable[Dict]] = None) -> str:
+        """
+        Get cleaned text suitable for reading
+        
+        Args:
+            pages: Optional page stream (e.g. from iter_pages()); defaults to self.pages
+        """
+        if pages is None:
+            # Lazy mode keeps no full page list, so stream the document instead
+            if self.lazy and not self.pages:
+                pages = self.iter_pages()
+            else:
+                # Full text is joined once and reused until the pages change
+                return self._get_page_index()['text']
+        return '\n\n'.join(page['cleaned_text'] for page in pages)
     
     def get_chapter_text(self, chapter_index: int) -> str:
         """Get text for a specific chapter"""
         if not self.chapters or chapter_index >= len(self.chapters):
             return self.get_text_for_reading()
         
+        if self.lazy and not self.pages:
+            return self._get_chapter_text_lazily(chapter_index)
+        
         start_page = self.chapters[chapter_index]['page']
-        end_page = self.chapters[chapter_index + 1]['page'] if chapter_index + 1 < len(self.chapters) else len(self.pages) + 1
+        end_page = self.chapters[chapter_index + 1]['page'] if chapter_index + 1 < len(self.chapters) else None
         
-        chapter_text = []
-        for page in self.pages:
-            if start_page <= page['page_number'] < end_page:
-                chapter_text.append(page['cleaned_text'])
+        # Chapter text is a slice of the cached full text, located via the page index
+        index = self._get_page_index()
+        first = bisect_left(index['page_numbers'], start_page)
+        last = bisect_left(index['page_numbers'], end_page) if end_page is not None else len(self.pages)
+        if first >= last:
+            return ''
         
-        return '\n\n'.join(chapter_text)
+        return index['text'][index['starts'][first]:index['ends'][last - 1]]
+    
+    def _get_page_index(self) -> Dict:
+        """
+        Page number -> position index plus character offsets into the joined text
+        Built once per page list and rebuilt only when self.pages is replaced or resized
+        """
+        index = self._page_index
+        if index is not None and index['pages'] is self.pages and index['count'] == len(self.pages):
+            return index
+        
+        page_numbers = []
+        positions = {}
+        starts = []
+        ends = []
+        offset = 0
+        for position, page in enumerate(self.pages):
+            page_numbers.append(page['page_number'])
+            positions[page['page_number']] = position
+            starts.append(offset)
+            offset += len(page['cleaned_text'])
+            ends.append(offset)
+            offset += 2  # '\n\n' separator
+        
+        self._page_index = {
+            'pages': self.pages,
+            'count': len(self.pages),
+            'page_numbers': page_numbers,
+            'positions': positions,
+            'starts': starts,
+            'ends': ends,
+            'text': '\n\n'.join(page['cleaned_text'] for page in self.pages)
+        }
+        return self._page_index
+    
+    def _detect_chapters_lazily(self) -> List[Dict]:
+        """
+        Find chapter boundaries without full extraction
+        Uses the PDF outline when present, otherwise scans the top of each page
+        through the text layer only (no pdfplumber layout or cropping)
+        """
+        with pdfplumber.open(self.pdf_path) as pdf:
+            self.total_pages = len(pdf.pages)
+            chapters = self._chapters_from_outline(pdf)
+            if chapters:
+                return chapters
+        
+        chapters = []
+        for page_number, text in iter_heading_text(self.pdf_path, HEADING_SCAN_FRACTION):
+            lines = text.split('\n')[:HEADING_SCAN_LINES]
+            for i, line in enumerate(lines):
+                line = line.strip()
+                if self._is_chapter_heading(line, i, len(lines)):
+                    chapters.append({
+                        'title': line,
+                        'page': page_number,
+                        'position': i,
+                        'line_position': i,
+                        'source': 'scan'
+                    })
+                    break
+        
+        return chapters
+    
+    def _get_total_pages(self) -> int:
+        """Page count of the document, read once"""
+        if self.total_pages is None:
+            with pdfplumber.open(self.pdf_path) as pdf:
+                self.total_pages = len(pdf.pages)
+        return self.total_pages
+    
+    def _chapters_from_outline(self, pdf) -> List[Dict]:
+        """Read top-level chapter entries from the PDF outline (bookmarks)"""
+        try:
+            from pdfminer.pdftypes import resolve1
+            
+            page_numbers = {page.page_obj.pageid: page.page_number for page in pdf.pages}
+            chapters = []
+            for level, title, dest, action, _ in pdf.doc.get_outlines():
+                if level != 1:
+                    continue
+                if dest is None and action:
+                    dest = resolve1(action).get('D')
+                dest = resolve1(dest)
+                if isinstance(dest, dict):
+                    dest = resolve1(dest.get('D'))
+                if not dest:
+                    continue
+                
+                page_ref = dest[0]
+                page_number = page_numbers.get(getattr(page_ref, 'objid', None))
+                if page_number:
+                    chapters.append({
+                        'title': title.strip(),
+                        'page': page_number,
+                        'position': 0,
+                        'line_position': 0,
+                        'source': 'outline'
+                    })
+            
+            chapters.sort(key=lambda chapter: chapter['page'])
+            return chapters
+        
+        except Exception:
+            # Missing or malformed outline: caller falls back to scanning pages
+            return []
+    
+    def _is_chapter_heading(self, line: str, position: int, total_lines: int) -> bool:
+        if not line:
+            return False
+        if self.use_ai and self.ai_analyzer:
+            return self.ai_analyzer.classify_line_type(line, position, total_lines) == 'chapter'
+        return any(re.match(pattern, line) for pattern in CHAPTER_PATTERNS)
+    
+    def _get_chapter_text_lazily(self, chapter_index: int) -> str:
+        """Extract only the pages of one chapter, reusing pages held in the LRU"""
+        start_page = self.chapters[chapter_index]['page']
+        if chapter_index + 1 < len(self.chapters):
+            end_page = self.chapters[chapter_index + 1]['page']
+        else:
+            end_page = self._get_total_pages() + 1
+        
+        pages = self.get_pages(range(start_page, end_page))
+        return '\n\n'.join(page['cleaned_text'] for page in pages)
+    
+    def get_pages(self, page_numbers: Iterable[int]) -> List[Dict]:
+        """
+        Get specific pages, extracting only those not already in the page LRU
+        
+        Args:
+            page_numbers: 1-indexed page numbers
+            
+        Returns:
+            Page dictionaries in the requested order (pages without text are omitted)
+        """
+        page_numbers = list(page_numbers)
+        if self.page_cache is None:
+            positions = self._get_page_index()['positions']
+            return [self.pages[positions[n]] for n in page_numbers if n in positions]
+        
+        found = {}
+        missing = []
+        for page_number in page_numbers:
+            page = self.page_cache.get(page_number)
+            if page is not None:
+                found[page_number] = page
+            else:
+                missing.append(page_number)
+        
+        if missing:
+            for page_data in self._get_backend().extract_pages(self, missing):
+                self.page_cache.put(page_data)
+                found[page_data['page_number']] = page_data
+            # Blank pages are cached too so they are not re-extracted
+            for page_number in missing:
+                if page_number not in found and 1 <= page_number <= self._get_total_pages():
+                    page_data = self._make_page(page_number, '')
+                    self.page_cache.put(page_data)
+                    found[page_number] = page_data
+        
+        return [found[n] for n in page_numbers if n in found and found[n]['text']]
     
     def get_structured_content_for_audiobook(self) -> Optional[Dict]:
         """
@@ -176,6 +773,7 @@ class PDFProcessor:
             self.structured_content = self.ai_analyzer.organize_text_for_audiobook(
                 self.pages, self.chapters
             )
+            self._save_to_cache()
         
         return self.structured_content
     
@@ -186,6 +784,7 @@ class PDFProcessor:
         
         if not self.document_structure:
             self.document_structure = self.ai_analyzer.identify_document_structure(self.pages)
+            self._save_to_cache()
         
         return self.document_structure
     
@@ -196,16 +795,28 @@ class PDFProcessor:
         
         return self.ai_analyzer.extract_footnotes_and_references(self.pages)
     
-    def export_to_json(self) -> Dict:
-        """Export document analysis to JSON-serializable format"""
+    def export_to_json(self, pages: Optional[Iterable[Dict]] = None) -> Dict:
+        """
+        Export document analysis to JSON-serializable format
+        
+        Args:
+            pages: Optional page stream (e.g. from iter_pages()). When given, page
+                statistics, footnotes and document structure are computed in a
+                single pass without keeping the pages in memory.
+        """
+        if pages is not None:
+            return self._export_stream_to_json(pages)
+        
         export_data = {
             'pdf_path': self.pdf_path,
-            'total_pages': len(self.pages),
+            # Lazy mode keeps no page list, so report the document's page count
+            'total_pages': self._get_total_pages() if self.lazy and not self.pages else len(self.pages),
             'chapters': self.chapters,
             'structured_content': self.get_structured_content_for_audiobook(),
             'document_structure': self.get_document_structure(),
             'footnotes_references': self.get_footnotes_and_references(),
-            'extraction_method': 'deepdoctection' if self.deepdoc_processor else 'pdfplumber'
+            'extraction_method': self._get_backend().name,
+            'ocr_pages': sum(1 for page in self.pages if page.get('text_source') == 'ocr')
         }
         
         # Add deepdoctection-specific data if used and not already processed
@@ -223,3 +834,126 @@ class PDFProcessor:
             }
         
         return export_data
+    
+    def _export_stream_to_json(self, pages: Iterable[Dict]) -> Dict:
+        """Build export_to_json() output from a page stream in a single pass"""
+        use_ai = self.use_ai and self.ai_analyzer
+        
+        total_pages = 0
+        total_tables = 0
+        total_images = 0
+        max_columns = 1
+        has_layout = False
+        footnotes = []
+        references = []
+        # identify_document_structure() only looks at the first and last 10 pages
+        head_pages = []
+        tail_pages = deque(maxlen=10)
+        
+        ocr_pages = 0
+        
+        for page in pages:
+            total_pages += 1
+            if page.get('text_source') == 'ocr':
+                ocr_pages += 1
+            if 'layout_elements' in page:
+                has_layout = True
+                if page.get('has_tables', False):
+                    total_tables += 1
+                if page.get('has_images', False):
+                    total_images += 1
+                max_columns = max(max_columns, page.get('columns', 1))
+            
+            if use_ai:
+                page_notes = self.ai_analyzer.extract_footnotes_and_references([page])
+                footnotes.extend(page_notes['footnotes'])
+                references.extend(page_notes['references'])
+                if len(head_pages) < 10:
+                    head_pages.append(page)
+                else:
+                    tail_pages.append(page)
+        
+        if use_ai and not self.document_structure:
+            self.document_structure = self.ai_analyzer.identify_document_structure(
+                head_pages + list(tail_pages)
+            )
+        
+        export_data = {
+            'pdf_path': self.pdf_path,
+            'total_pages': total_pages,
+            'chapters': self.chapters,
+            # Chapter organization needs random access to pages; only reuse a cached result
+            'structured_content': self.structured_content if use_ai else None,
+            'document_structure': self.document_structure if use_ai else None,
+            'footnotes_references': {
+                'footnotes': footnotes,
+                'references': references
+            } if use_ai else None,
+            'extraction_method': self._get_backend().name,
+            'ocr_pages': ocr_pages
+        }
+        
+        if self.deepdoc_processor and has_layout:
+            export_data['deepdoctection_analysis'] = {
+                'total_tables': total_tables,
+                'total_images': total_images,
+                'max_columns': max_columns,
+                'has_complex_layout': max_columns > 1 or total_tables > 0
+            }
+        
+        return export_data
+    
+    def _cache_settings(self) -> Dict:
+        """Extractor settings that change the cached result"""
+        return {
+            'extractor': self._get_backend().name,
+            'use_ai': self.use_ai,
+            'cleaning_rules': CLEANING_RULES_VERSION,
+            'crop_margins': self.crop_margins,
+            'ocr': self.ocr_processor is not None
+        }
+    
+    def _get_cache_key(self) -> str:
+        # Rebuilt when the settings change, e.g. deepdoctection failing before its
+        # first page switches extraction_method to pdfplumber mid-run
+        settings = self._cache_settings()
+        if self._cache_key is None or self._cache_key[0] != settings:
+            self._cache_key = (settings, self.cache.make_key(self.pdf_path, settings))
+        return self._cache_key[1]
+    
+    def _load_from_cache(self) -> bool:
+        """Restore pages, chapters and analysis from the cache; returns True on a hit"""
+        if not self.cache:
+            return False
+        
+        try:
+            entry = self.cache.get(self._get_cache_key())
+        except OSError as e:
+            print(f"Note: extraction cache unavailable: {e}")
+            return False
+        
+        if not entry:
+            return False
+        
+        self.pages = [PageRecord.from_dict(page) for page in entry['pages']]
+        if entry.get('chapters') is not None:
+            self.chapters = entry['chapters']
+            self._chapters_detected = True
+        self.structured_content = entry.get('structured_content')
+        self.document_structure = entry.get('document_structure')
+        return True
+    
+    def _save_to_cache(self):
+        """Write current pages, chapters and analysis to the cache"""
+        if not self.cache or not self.pages:
+            return
+        
+        try:
+            self.cache.put(self._get_cache_key(), {
+                'pages': [page.to_dict(include_spans=True) for page in self.pages],
+                'chapters': self.chapters if self._chapters_detected else None,
+                'structured_content': self.structured_content,
+                'document_structure': self.document_structure
+            })
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Note: could not update extraction cache: {e}")